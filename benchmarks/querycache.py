@@ -0,0 +1,110 @@
+#! /usr/bin/env python3
+"""Benchmark of the compiled SQL cache against regular peewee queries.
+
+Prints the mean time per query in microseconds on an in-memory SQLite
+database for SQL generation only, primary key lookups and uniqueness
+probes, each with and without the cache.
+"""
+
+from argparse import ArgumentParser, Namespace
+from timeit import timeit
+from typing import Any, Callable
+
+from peewee import CharField, IntegerField, Model, SqliteDatabase
+
+from peeweeplus.json.deserialization import is_unique
+from peeweeplus.querycache import QUERY_CACHE, get_by_id
+
+
+DATABASE = SqliteDatabase(":memory:")
+
+
+class Record(Model):
+    """A record with a unique name."""
+
+    class Meta:
+        database = DATABASE
+
+    name = CharField(unique=True)
+    value = IntegerField(default=0)
+
+
+def get_args() -> Namespace:
+    """Parses the command line arguments."""
+
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "-n", "--number", type=int, default=20000, help="queries per measurement"
+    )
+    parser.add_argument(
+        "-r", "--records", type=int, default=1000, help="records in the table"
+    )
+    return parser.parse_args()
+
+
+def is_unique_uncached(record: Model, field: CharField, value: Any) -> bool:
+    """The uniqueness probe without the query cache."""
+
+    model = field.model
+
+    try:
+        model.get((field == value) & (model._meta.primary_key != record._pk))
+    except model.DoesNotExist:
+        return True
+
+    return False
+
+
+def compile_uncached() -> tuple[str, list]:
+    """Generates the SQL of a primary key lookup."""
+
+    query = Record.select().where(Record.id == 3).limit(1)
+    return DATABASE.get_sql_context().sql(query).query()
+
+
+def compile_cached() -> list:
+    """Binds the parameters of the cached primary key lookup."""
+
+    return QUERY_CACHE.compile((Record, "get_by_id"), None, DATABASE).bind(
+        {"primary_key": 3}
+    )
+
+
+def measure(function: Callable[[], Any], number: int) -> float:
+    """Returns the mean time per call in microseconds."""
+
+    return timeit(function, number=number) / number * 1_000_000
+
+
+def main() -> None:
+    """Runs the benchmark."""
+
+    args = get_args()
+    DATABASE.create_tables([Record])
+    Record.insert_many([{"name": f"record-{i}"} for i in range(args.records)]).execute()
+    record = Record.get(Record.name == "record-1")
+    get_by_id(Record, 1)  # Compile the lookup for compile_cached().
+    benchmarks = {
+        "SQL generation": (compile_uncached, compile_cached),
+        "primary key lookup": (
+            lambda: Record.get(Record.id == 3),
+            lambda: get_by_id(Record, 3),
+        ),
+        "uniqueness probe": (
+            lambda: is_unique_uncached(record, Record.name, "unknown"),
+            lambda: is_unique(record, Record.name, "unknown"),
+        ),
+    }
+
+    print(f"{'query':<20} {'uncached µs':>12} {'cached µs':>12} {'speedup':>8}")
+
+    for name, (uncached, cached) in benchmarks.items():
+        before = measure(uncached, args.number)
+        after = measure(cached, args.number)
+        print(f"{name:<20} {before:>12.2f} {after:>12.2f} {before / after:>7.1f}x")
+
+    print(QUERY_CACHE.cache_info())
+
+
+if __name__ == "__main__":
+    main()
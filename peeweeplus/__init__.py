@@ -2,14 +2,16 @@
 
 from logging import getLogger
 
+from peeweeplus.aio import AsyncDatabase
 from peeweeplus.contextmanagers import ChangedConnection
 from peeweeplus.converters import dec2dom
 from peeweeplus.converters import dec2dict
 from peeweeplus.converters import dec2orm
 from peeweeplus.converters import date2orm
 from peeweeplus.converters import datetime2orm
-from peeweeplus.database import MySQLDatabase
+from peeweeplus.database import MySQLDatabase, PooledMySQLDatabase
 from peeweeplus.dbproxy import DatabaseProxy, MySQLDatabaseProxy
+from peeweeplus.dbproxy import PooledMySQLDatabaseProxy
 from peeweeplus.exceptions import FieldValueError
 from peeweeplus.exceptions import FieldNotNullable
 from peeweeplus.exceptions import MissingKeyError
@@ -18,12 +20,15 @@ from peeweeplus.exceptions import NonUniqueValue
 from peeweeplus.exceptions import PasswordTooShort
 from peeweeplus.fields import *
 from peeweeplus.fields import FIELDS
+from peeweeplus.instrumentation import QueryMetrics
 from peeweeplus.json import deserialize
 from peeweeplus.json import serialize
 from peeweeplus.json import JSONMixin
 from peeweeplus.json import JSONModel
 from peeweeplus.mixins import FileMixin
 from peeweeplus.model import select_tree
+from peeweeplus.querycache import Param, QueryCache
+from peeweeplus.resultcache import ResultCache
 from peeweeplus.transaction import Transaction
 
 
@@ -42,11 +47,18 @@ __all__ = [
     "deserialize",
     "select_tree",
     "serialize",
+    "AsyncDatabase",
     "ChangedConnection",
     "DatabaseProxy",
     "FileMixin",
     "MySQLDatabase",
     "MySQLDatabaseProxy",
+    "PooledMySQLDatabase",
+    "PooledMySQLDatabaseProxy",
+    "Param",
+    "QueryCache",
+    "QueryMetrics",
+    "ResultCache",
     "JSONMixin",
     "JSONModel",
     "Transaction",
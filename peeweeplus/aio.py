@@ -0,0 +1,188 @@
+"""Asynchronous facade for use with asyncio."""
+
+from asyncio import CancelledError, Queue, get_running_loop, shield, wrap_future
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from functools import partial
+from typing import Any, AsyncIterator, Callable, NamedTuple, Type, Union
+
+from peewee import Database, Model, Query
+
+from peeweeplus.dbproxy import DatabaseProxy
+from peeweeplus.json.deserialization import deserialize
+from peeweeplus.json.serialization import serialize_all
+
+
+__all__ = ["AsyncDatabase", "ExecutorStats"]
+
+
+WORKERS = 4
+
+
+class ExecutorStats(NamedTuple):
+    """Worker and queue statistics."""
+
+    workers: int
+    busy: int
+    waiting: int
+
+
+class AsyncDatabase:
+    """Runs blocking database operations on a bounded pool of worker
+    threads, each of which holds its own connection.
+
+    The number of workers limits the concurrency. Callers beyond that
+    limit wait for a free worker without blocking the event loop.
+    Operations inside an atomic() block are pinned to one worker, since
+    transactions are bound to the connection of one thread.
+
+    Cancelling a caller that waits for a worker or whose operation has
+    not started yet withdraws the operation. An operation that is already
+    running cannot be interrupted and completes in the background, while
+    its worker stays busy until then.
+    """
+
+    def __init__(
+        self, database: Union[Database, DatabaseProxy], *, workers: int = WORKERS
+    ):
+        self.database = database
+        self._workers = [
+            ThreadPoolExecutor(1, thread_name_prefix=f"peeweeplus-{index}")
+            for index in range(workers)
+        ]
+        self._idle = None
+        self._waiting = 0
+        self._pinned = ContextVar(f"pinned-{id(self)}", default=None)
+
+    def stats(self) -> ExecutorStats:
+        """Returns the worker and queue statistics."""
+        idle = len(self._workers) if self._idle is None else self._idle.qsize()
+        return ExecutorStats(
+            len(self._workers), len(self._workers) - idle, self._waiting
+        )
+
+    async def run(self, function: Callable[..., Any], *args, **kwargs) -> Any:
+        """Runs the function on a worker and returns its result."""
+        if (worker := self._pinned.get()) is not None:
+            return await self._submit(worker, function, *args, **kwargs)
+
+        loop = get_running_loop()
+        worker = await self._acquire()
+
+        try:
+            future = worker.submit(partial(function, *args, **kwargs))
+        except BaseException:
+            self._release(worker)
+            raise
+
+        # Release the worker once the function has returned or was withdrawn.
+        future.add_done_callback(
+            lambda _: loop.call_soon_threadsafe(self._release, worker)
+        )
+        return await wrap_future(future)
+
+    async def execute(self, query: Query) -> Any:
+        """Executes a write query and returns its result,
+        e.g. the number of affected rows or the inserted ID.
+        """
+        return await self.run(query.execute)
+
+    async def fetch(self, query: Query) -> list:
+        """Returns the rows of a select query."""
+        return await self.run(list, query)
+
+    async def scalar(self, query: Query) -> Any:
+        """Returns the first value of the first row of a select query."""
+        return await self.run(query.scalar)
+
+    async def save(self, record: Model, **kwargs) -> int:
+        """Saves the record."""
+        return await self.run(record.save, **kwargs)
+
+    async def to_json(self, query: Query, **kwargs) -> list[dict]:
+        """Returns the JSON-ish dicts of the selected records.
+        See serialize_all() for the keyword arguments.
+        """
+        return await self.run(serialize_all, query, **kwargs)
+
+    async def from_json(self, model: Type[Model], json: dict, **kwargs) -> Model:
+        """Creates a new record from a JSON-ish dict.
+        See deserialize() for the keyword arguments.
+        """
+        return await self.run(deserialize, model, json, **kwargs)
+
+    @asynccontextmanager
+    async def atomic(self) -> AsyncIterator[None]:
+        """Runs the operations of the block in a transaction
+        or, if nested, in a savepoint on one worker.
+        """
+        if (worker := self._pinned.get()) is None:
+            worker = await self._acquire()
+            token = self._pinned.set(worker)
+        else:
+            token = None
+
+        try:
+            atomic = await self._submit(worker, self.database.atomic)
+            await self._enter(worker, atomic)
+
+            try:
+                yield
+            except BaseException as error:
+                await self._exit(
+                    worker, atomic, type(error), error, error.__traceback__
+                )
+                raise
+
+            await self._exit(worker, atomic, None, None, None)
+        finally:
+            if token is not None:
+                self._pinned.reset(token)
+                self._release(worker)
+
+    async def close(self) -> None:
+        """Closes the workers' connections and shuts down the workers."""
+        for worker in self._workers:
+            await wrap_future(worker.submit(self.database.close))
+            worker.shutdown(wait=False, cancel_futures=True)
+
+    async def _acquire(self) -> ThreadPoolExecutor:
+        """Waits for an idle worker."""
+        if self._idle is None:
+            self._idle = Queue()
+
+            for worker in self._workers:
+                self._idle.put_nowait(worker)
+
+        self._waiting += 1
+
+        try:
+            return await self._idle.get()
+        finally:
+            self._waiting -= 1
+
+    def _release(self, worker: ThreadPoolExecutor) -> None:
+        """Returns the worker to the idle workers."""
+        self._idle.put_nowait(worker)
+
+    async def _submit(
+        self, worker: ThreadPoolExecutor, function: Callable[..., Any], *args, **kwargs
+    ) -> Any:
+        """Runs the function on the respective worker."""
+        return await wrap_future(worker.submit(partial(function, *args, **kwargs)))
+
+    async def _enter(self, worker: ThreadPoolExecutor, atomic: Any) -> None:
+        """Begins the transaction. If cancelled meanwhile, rolls it
+        back once it has begun, so that it is not left open on the
+        worker's connection.
+        """
+        try:
+            await shield(wrap_future(worker.submit(atomic.__enter__)))
+        except CancelledError as error:
+            await self._exit(worker, atomic, type(error), error, error.__traceback__)
+            raise
+
+    async def _exit(self, worker: ThreadPoolExecutor, atomic: Any, *exc_info) -> None:
+        """Commits or rolls back the transaction, even if cancelled."""
+        await shield(wrap_future(worker.submit(atomic.__exit__, *exc_info)))
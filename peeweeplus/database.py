@@ -1,26 +1,235 @@
 """Database enhancements."""
 
+from contextlib import contextmanager, nullcontext
+from functools import partial
 from logging import getLogger
-from typing import Any
+from threading import local
+from time import monotonic, perf_counter
+from typing import Any, Iterable, Iterator, Optional, Union
 
+from peewee import Database, DatabaseProxy
 from peewee import MySQLDatabase as _MySQLDatabase
+from peewee import mysql
+from playhouse.pool import PooledMySQLDatabase as _PooledMySQLDatabase
 
+from peeweeplus.instrumentation import QueryMetrics
+from peeweeplus.resultcache import ResultCache
 
-__all__ = ["MySQLDatabase"]
+
+__all__ = ["MySQLDatabase", "PooledMySQLDatabase", "get_chunk_size"]
 
 
 LOGGER = getLogger(__file__)
+MAX_PARAMETERS = 999  # SQLite's conservative default.
+MAX_ROWS = 1000  # Bounds the packet size of client-side interpolated statements.
+
+
+def get_chunk_size(database: Union[Database, DatabaseProxy], parameters: int) -> int:
+    """Returns the number of rows per statement that bind the given
+    number of parameters per row, limited by the database's maximum
+    number of parameters and by MAX_ROWS.
+    """
+
+    max_parameters = getattr(database, "max_parameters", MAX_PARAMETERS)
+    return max(1, min(MAX_ROWS, max_parameters // max(parameters, 1)))
 
 
 class MySQLDatabase(_MySQLDatabase):
     """Extension of peewee.MySQLDatabase with closing option."""
 
-    def execute_sql(self, *args, **kwargs) -> Any:
+    # Maximum placeholders per server-side prepared statement. The drivers
+    # interpolate parameters on the client, where max_allowed_packet limits
+    # the statement size instead, see MAX_ROWS.
+    max_parameters = 65535
+
+    def __init__(
+        self,
+        *args,
+        metrics: Optional[QueryMetrics] = None,
+        result_cache: Optional[ResultCache] = None,
+        **kwargs,
+    ):
+        self.metrics = metrics
+        self.result_cache = result_cache
+        self._local = local()
+        super().__init__(*args, **kwargs)
+
+    def execute_sql(
+        self, sql: str, params: Optional[Iterable] = None, *args, **kwargs
+    ) -> Any:
+        """Executes the SQL query, using the result cache, if any.
+
+        Selects that only refer to cached tables are answered from the
+        cache outside of transactions. Other statements invalidate the
+        cached tables they refer to after execution and, within a
+        transaction, again after its commit or rollback.
+        """
+        if (cache := self.result_cache) is None or self.is_streaming():
+            return self._execute_in_context(sql, params, *args, **kwargs)
+
+        select, tables = cache.get_tables(sql)
+
+        if not tables:
+            return self._execute_in_context(sql, params, *args, **kwargs)
+
+        if not select:
+            try:
+                return self._execute_in_context(sql, params, *args, **kwargs)
+            finally:
+                self._invalidate(tables)
+
+        if self._state.transactions:
+            return self._execute_in_context(sql, params, *args, **kwargs)
+
+        return cache.execute(
+            partial(self._execute_in_context, sql, params, *args, **kwargs),
+            sql,
+            params,
+            tables,
+        )
+
+    def commit(self) -> None:
+        """Commits the transaction and invalidates the written tables."""
+        try:
+            super().commit()
+        finally:
+            self._invalidate_pending()
+
+    def rollback(self) -> None:
+        """Rolls back the transaction and invalidates the written tables."""
+        try:
+            super().rollback()
+        finally:
+            self._invalidate_pending()
+
+    def _invalidate(self, tables: frozenset[str]) -> None:
+        """Invalidates the tables in the result cache and remembers them
+        for invalidation at the end of the current transaction, if any.
+        """
+        self.result_cache.invalidate(tables)
+
+        if self._state.transactions:
+            self._local.tables = getattr(self._local, "tables", frozenset()) | tables
+
+    def _invalidate_pending(self) -> None:
+        """Invalidates the tables written in the ended transaction."""
+        if tables := getattr(self._local, "tables", None):
+            self._local.tables = frozenset()
+            self.result_cache.invalidate(tables)
+
+    def _execute_in_context(self, *args, **kwargs) -> Any:
         """Conditionally execute the SQL query in an
         execution context iff closing is enabled.
         """
-        if self._state.transactions:
-            return super().execute_sql(*args, **kwargs)
+        if self._state.transactions or self.is_streaming():
+            return self._execute_sql(*args, **kwargs)
 
         with self.connection_context():
-            return super().execute_sql(*args, **kwargs)
+            return self._execute_sql(*args, **kwargs)
+
+    def _execute_sql(self, sql: str, *args, **kwargs) -> Any:
+        """Executes the SQL query and records it in the metrics, if any."""
+        if (metrics := self.metrics) is None:
+            return super().execute_sql(sql, *args, **kwargs)
+
+        start = perf_counter()
+        cursor = super().execute_sql(sql, *args, **kwargs)
+        rows = -1 if self.is_streaming() else cursor.rowcount  # Not yet known.
+        metrics.record(sql, perf_counter() - start, rows)
+        return cursor
+
+    def cursor(self, *args, **kwargs) -> Any:
+        """Returns a server-side cursor when streaming."""
+        if (cursors := getattr(self._local, "cursors", None)) is None:
+            return super().cursor(*args, **kwargs)
+
+        cursors.append(cursor := self.connection().cursor(mysql.cursors.SSCursor))
+        return cursor
+
+    def is_streaming(self) -> bool:
+        """Checks whether the current thread streams query results."""
+        return getattr(self._local, "cursors", None) is not None
+
+    @contextmanager
+    def streaming(self) -> Iterator[None]:
+        """Executes the current thread's queries with unbuffered
+        server-side cursors, which yield rows as they arrive
+        instead of loading the entire result set first.
+
+        The connection is kept open until the context exits and
+        only closed then if it was opened by the context.
+        A result must be consumed entirely before executing the next
+        query, so records must not load related records lazily while
+        iterating, e.g. use serialize_many() or stream_json() on a select.
+        """
+        if self.is_streaming():
+            yield
+            return
+
+        self._local.cursors = cursors = []
+
+        try:
+            with self.connection_context() if self.is_closed() else nullcontext():
+                try:
+                    yield
+                finally:
+                    for cursor in cursors:
+                        cursor.close()  # Discards unread rows.
+        finally:
+            self._local.cursors = None
+
+
+class PooledMySQLDatabase(_PooledMySQLDatabase, MySQLDatabase):
+    """A MySQL database with a connection pool.
+
+    Closing a connection, e.g. after a query outside of a transaction,
+    returns it to the pool instead of closing it, after rolling back
+    any open transaction. On checkout, pooled connections are discarded
+    if they exceeded the stale timeout (since creation) or the idle
+    timeout (since check-in), or fail a ping.
+    """
+
+    def __init__(
+        self, database: Optional[str], idle_timeout: Optional[float] = None, **kwargs
+    ):
+        self._idle_timeout = idle_timeout
+        self._idle_since = {}
+        super().__init__(database, **kwargs)
+
+    def init(
+        self, database: Optional[str], idle_timeout: Optional[float] = None, **kwargs
+    ) -> None:
+        """Initializes the database and pool settings."""
+        super().init(database, **kwargs)
+
+        if idle_timeout is not None:
+            self._idle_timeout = float(idle_timeout)
+
+    def _is_closed(self, conn: Any) -> bool:
+        """Checks whether a pooled connection is unusable on checkout."""
+        idle_since = self._idle_since.pop(self.conn_key(conn), None)
+
+        if (
+            self._idle_timeout
+            and idle_since is not None
+            and monotonic() - idle_since > self._idle_timeout
+        ):
+            LOGGER.debug("Connection %s was idle, closing.", self.conn_key(conn))
+            self._close_raw(conn)
+            return True
+
+        return super()._is_closed(conn)
+
+    def _close(self, conn: Any, close_conn: bool = False) -> None:
+        """Returns the connection to the pool and records its check-in time."""
+        with self._pool_lock:
+            super()._close(conn, close_conn=close_conn)
+
+            if any(pooled is conn for *_, pooled in self._connections):
+                self._idle_since[self.conn_key(conn)] = monotonic()
+
+    def close_idle(self) -> None:
+        """Closes the pooled connections and forgets their check-in times."""
+        with self._pool_lock:
+            super().close_idle()
+            self._idle_since.clear()
@@ -1,25 +1,57 @@
 """Database proxies."""
 
 from configparser import ConfigParser
+from contextlib import contextmanager
+from inspect import ismethod
+from itertools import count
 from logging import getLogger
 from pathlib import Path
-from typing import Any, Optional, Type, Union
+from threading import Lock, local
+from typing import Any, Iterator, Optional, Type, Union
 
-from peewee import Database
+from peewee import Database, Query, SelectBase
+from playhouse.pool import PooledDatabase
 
 from configlib import search_paths
 
-from peeweeplus.database import MySQLDatabase
+from peeweeplus.database import MySQLDatabase, PooledMySQLDatabase
 
 
-__all__ = ["DatabaseProxy", "MySQLDatabaseProxy"]
+__all__ = ["DatabaseProxy", "MySQLDatabaseProxy", "PooledMySQLDatabaseProxy"]
 
 
 LOGGER = getLogger(__file__)
+CONFIGS = {}
+CONFIGS_LOCK = Lock()
+
+
+def get_config(config_file: Union[Path, str]) -> ConfigParser:
+    """Returns the parsed config file, which is cached per path."""
+
+    with CONFIGS_LOCK:
+        try:
+            return CONFIGS[key := str(config_file)]
+        except KeyError:
+            LOGGER.debug('Loading database config from "%s".', config_file)
+
+        config = CONFIGS[key] = ConfigParser()
+
+        for filename in search_paths(config_file):
+            config.read(filename)
+
+        return config
 
 
 class DatabaseProxy:
-    """Proxies to a MySQL database."""
+    """Proxies to a MySQL database.
+
+    If the config section lists replica hosts, e.g.
+    "replicas = db-replica1, db-replica2", select queries outside of
+    transactions and use_primary() contexts are routed to the replicas,
+    either round-robin or, if "replica_selection = least_busy", to the
+    replica with the fewest running queries.
+    Raw SQL, streamed results and all other queries are sent to the primary.
+    """
 
     def __init__(
         self,
@@ -31,6 +63,13 @@ class DatabaseProxy:
         self.config_file = config_file or f"{database}.conf"
         self.config_section = config_section
         self._database = self._dbtype(database)
+        self._replicas = []
+        self._least_busy = False
+        self._busy = {}
+        self._busy_lock = Lock()
+        self._counter = count()
+        self._local = local()
+        self._lock = Lock()
         self._initialized = False
 
     def __init_subclass__(cls, *, dbtype: Optional[Type[Database]] = None):
@@ -40,33 +79,132 @@ class DatabaseProxy:
     def __getattr__(self, attribute: str) -> Any:
         """Delegates to the database while ensuring
         to load the config file beforehand.
+
+        Methods of the initialized database are bound to the proxy,
+        so that subsequent calls no longer go through this method.
         """
         if not self._initialized:
             self._initialize()
 
-        return getattr(self._database, attribute)
+        if ismethod(value := getattr(self._database, attribute)):
+            self.__dict__[attribute] = value
+
+        return value
+
+    def execute(self, query: Query, **context_options) -> Any:
+        """Executes the query on a replica or on the primary database."""
+        if not self._initialized:
+            self._initialize()
+
+        if (replica := self._get_replica(query)) is None:
+            return self._database.execute(query, **context_options)
+
+        if not self._least_busy:
+            return replica.execute(query, **context_options)
+
+        try:
+            return replica.execute(query, **context_options)
+        finally:
+            with self._busy_lock:
+                self._busy[replica] -= 1
+
+    @contextmanager
+    def use_primary(self) -> Iterator[None]:
+        """Routes all queries of the current thread to the
+        primary database, e.g. to read one's own writes.
+        """
+        self._local.primary = getattr(self._local, "primary", 0) + 1
+
+        try:
+            yield
+        finally:
+            self._local.primary -= 1
+
+    def _get_replica(self, query: Query) -> Optional[Database]:
+        """Returns a replica to execute the query on or None
+        if the query must be executed on the primary database.
+        """
+        if (
+            not self._replicas
+            or not isinstance(query, SelectBase)
+            or getattr(query, "_for_update", None)
+            or getattr(self._local, "primary", 0)
+            or self._database.in_transaction()
+            or getattr(self._database, "is_streaming", bool)()  # Only MySQL streams.
+        ):
+            return None
+
+        if not self._least_busy:
+            return self._replicas[next(self._counter) % len(self._replicas)]
+
+        with self._busy_lock:
+            replica = min(self._replicas, key=self._busy.__getitem__)
+            self._busy[replica] += 1
+
+        return replica
 
     def _initialize(self) -> None:
-        """Initializes the database."""
+        """Initializes the database once."""
+        with self._lock:
+            if not self._initialized:
+                self._initialize_database(get_config(self.config_file))
+
+    def _initialize_database(self, config: ConfigParser) -> None:
+        """Initializes the database and its replicas from the config."""
         LOGGER.debug(
-            'Loading database config from "%s" section "%s".',
-            self.config_file,
+            'Initializing database "%s" from config section "%s".',
+            self.database,
             self.config_section,
         )
-        config = ConfigParser()
-
-        for filename in search_paths(self.config_file):
-            config.read(filename)
-
+        settings = {
+            "user": config.get(self.config_section, "user", fallback=self.database),
+            "passwd": config.get(self.config_section, "passwd"),
+            "charset": config.get(self.config_section, "charset", fallback="utf8mb4"),
+            **self._get_pool_settings(config),
+        }
         self._database.init(
-            database := self.database,
+            self.database,
             host=config.get(self.config_section, "host", fallback="localhost"),
-            user=config.get(self.config_section, "user", fallback=database),
-            passwd=config.get(self.config_section, "passwd"),
-            charset=config.get(self.config_section, "charset", fallback="utf8mb4"),
+            **settings,
+        )
+        self._replicas = [
+            self._dbtype(self.database, host=host, **settings)
+            for host in self._get_replica_hosts(config)
+        ]
+        self._busy = dict.fromkeys(self._replicas, 0)
+        self._least_busy = (
+            config.get(self.config_section, "replica_selection", fallback="")
+            == "least_busy"
         )
         self._initialized = True
 
+    def _get_replica_hosts(self, config: ConfigParser) -> list[str]:
+        """Returns the configured replica hosts."""
+        hosts = config.get(self.config_section, "replicas", fallback="")
+        return [host.strip() for host in hosts.split(",") if host.strip()]
+
+    def _get_pool_settings(self, config: ConfigParser) -> dict[str, Any]:
+        """Returns the connection pool settings, if applicable."""
+        if not isinstance(self._database, PooledDatabase):
+            return {}
+
+        return {
+            "max_connections": config.getint(
+                self.config_section, "max_connections", fallback=20
+            ),
+            "stale_timeout": config.getfloat(
+                self.config_section, "stale_timeout", fallback=None
+            ),
+            "idle_timeout": config.getfloat(
+                self.config_section, "idle_timeout", fallback=None
+            ),
+            "timeout": config.getfloat(self.config_section, "timeout", fallback=None),
+        }
+
 
 class MySQLDatabaseProxy(DatabaseProxy, dbtype=MySQLDatabase):
     """A MySQL database proxy."""
+
+
+class PooledMySQLDatabaseProxy(DatabaseProxy, dbtype=PooledMySQLDatabase):
+    """A MySQL database proxy with a connection pool."""
@@ -0,0 +1,116 @@
+"""Query timing and fingerprint instrumentation."""
+
+from bisect import bisect_left
+from functools import lru_cache
+from logging import getLogger
+from re import IGNORECASE, compile as compile_regex
+from threading import Lock
+from typing import NamedTuple, Optional
+
+
+__all__ = ["QueryMetrics", "QueryStats", "fingerprint"]
+
+
+LOGGER = getLogger(__file__)
+BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)  # Upper bounds in seconds.
+PATTERNS = (
+    (compile_regex(r"'(?:[^'\\]|\\.|'')*'"), "?"),  # Single-quoted strings.
+    (compile_regex(r'"(?:[^"\\]|\\.|"")*"'), "?"),  # Double-quoted strings.
+    (compile_regex(r"\b0x[0-9a-f]+\b", IGNORECASE), "?"),  # Hex literals.
+    (compile_regex(r"(?<![\w`])-?\d+(?:\.\d+)?(?:e[+-]?\d+)?\b", IGNORECASE), "?"),
+    (compile_regex(r"%s|\?"), "?"),  # Placeholders.
+    (compile_regex(r"\(\s*\?(?:\s*,\s*\?)+\s*\)"), "(?+)"),  # Value lists.
+    (compile_regex(r"\s+"), " "),
+)
+
+
+@lru_cache(maxsize=4096)
+def fingerprint(sql: str) -> str:
+    """Returns the SQL query with literals and placeholders
+    replaced and value lists and whitespace collapsed.
+    """
+
+    for pattern, replacement in PATTERNS:
+        sql = pattern.sub(replacement, sql)
+
+    return sql.strip()
+
+
+class QueryStats(NamedTuple):
+    """Statistics of queries with the same fingerprint."""
+
+    count: int
+    total: float
+    max: float
+    rows: int
+    histogram: tuple[int, ...]  # Counts per bucket, last one unbounded.
+
+    @property
+    def mean(self) -> float:
+        """Returns the mean latency."""
+        return self.total / self.count if self.count else 0.0
+
+
+class QueryMetrics:
+    """Collects query latency histograms per query fingerprint."""
+
+    def __init__(
+        self,
+        slow_query_threshold: Optional[float] = None,
+        buckets: tuple[float, ...] = BUCKETS,
+    ):
+        """Sets the slow query log threshold in seconds and the buckets."""
+        self.slow_query_threshold = slow_query_threshold
+        self.buckets = buckets
+        self._stats = {}
+        self._lock = Lock()
+
+    def record(self, sql: str, duration: float, rows: int) -> None:
+        """Records a query execution."""
+        key = fingerprint(sql)
+        bucket = bisect_left(self.buckets, duration)
+
+        with self._lock:
+            try:
+                stats = self._stats[key]
+            except KeyError:
+                stats = self._stats[key] = [
+                    0,
+                    0.0,
+                    0.0,
+                    0,
+                    [0] * (len(self.buckets) + 1),
+                ]
+
+            stats[0] += 1
+            stats[1] += duration
+            stats[2] = max(stats[2], duration)
+            stats[3] += max(rows, 0)
+            stats[4][bucket] += 1
+
+        if (
+            self.slow_query_threshold is not None
+            and duration >= self.slow_query_threshold
+        ):
+            LOGGER.warning("Slow query (%.3f s, %i rows): %s", duration, rows, sql)
+
+    def snapshot(self) -> dict[str, QueryStats]:
+        """Returns the current statistics per fingerprint."""
+        with self._lock:
+            return _freeze(self._stats)
+
+    def reset(self) -> dict[str, QueryStats]:
+        """Returns the current statistics and resets them."""
+        with self._lock:
+            stats, self._stats = self._stats, {}
+
+        return _freeze(stats)
+
+
+def _freeze(stats: dict[str, list]) -> dict[str, QueryStats]:
+    """Returns immutable copies of the statistics."""
+
+    return {
+        key: QueryStats(count, total, max_, rows, tuple(histogram))
+        for key, (count, total, max_, rows, histogram) in stats.items()
+    }
@@ -1,8 +1,35 @@
 """JSON serialization and deserialization API."""
 
-from peeweeplus.json.deserialization import deserialize, patch
+from peeweeplus.json.cache import CacheBackend, JSONCache, LRUBackend
+from peeweeplus.json.deserialization import deserialize, deserialize_many
+from peeweeplus.json.deserialization import insert_json, patch, save_changes
+from peeweeplus.json.encoding import Encoder, serialize_bytes
+from peeweeplus.json.export import export, export_shards
 from peeweeplus.json.model import JSONMixin, JSONModel
-from peeweeplus.json.serialization import serialize
+from peeweeplus.json.serialization import select_for_json, serialize
+from peeweeplus.json.serialization import serialize_all
+from peeweeplus.json.serialization import serialize_many
+from peeweeplus.json.streaming import stream_json
 
 
-__all__ = ["deserialize", "patch", "serialize", "JSONMixin", "JSONModel"]
+__all__ = [
+    "deserialize",
+    "deserialize_many",
+    "export",
+    "export_shards",
+    "insert_json",
+    "patch",
+    "save_changes",
+    "select_for_json",
+    "serialize",
+    "serialize_all",
+    "serialize_bytes",
+    "serialize_many",
+    "stream_json",
+    "CacheBackend",
+    "Encoder",
+    "JSONCache",
+    "JSONMixin",
+    "JSONModel",
+    "LRUBackend",
+]
@@ -0,0 +1,62 @@
+"""Chunked base64 handling of binary data."""
+
+from base64 import b64decode
+from binascii import Error, a2b_base64, b2a_base64
+from hashlib import sha256
+from math import ceil
+from typing import Union
+
+
+__all__ = ["blob_stub", "decode_blob", "encode_blob"]
+
+
+ENCODE_CHUNK_SIZE = 3 * 64 * 1024  # Multiple of 3 to avoid inner padding.
+DECODE_CHUNK_SIZE = 4 * 64 * 1024  # Multiple of 4 to decode whole quanta.
+
+
+def encode_blob(value: Union[bytes, bytearray, memoryview]) -> str:
+    """Encodes binary data as base64 text.
+
+    The data is encoded in chunks of a memoryview into a pre-allocated
+    buffer, so that neither slices of the data nor growing intermediate
+    results are copied.
+    """
+
+    view = memoryview(value).cast("B")
+    buffer = bytearray(4 * ceil(len(view) / 3))
+    position = 0
+
+    for offset in range(0, len(view), ENCODE_CHUNK_SIZE):
+        chunk = b2a_base64(view[offset : offset + ENCODE_CHUNK_SIZE], newline=False)
+        buffer[position : (position := position + len(chunk))] = chunk
+
+    return buffer.decode("ascii")
+
+
+def decode_blob(value: str) -> bytes:
+    """Decodes base64 text into binary data.
+
+    The text is decoded in chunks into a pre-allocated buffer instead of
+    encoding the entire text to ASCII bytes first. Falls back to decoding
+    the entire text if chunk boundaries do not align with base64 quanta,
+    e.g. due to embedded whitespace.
+    """
+
+    buffer = bytearray(3 * ceil(len(value) / 4))
+    position = 0
+
+    try:
+        for offset in range(0, len(value), DECODE_CHUNK_SIZE):
+            chunk = a2b_base64(value[offset : offset + DECODE_CHUNK_SIZE])
+            buffer[position : (position := position + len(chunk))] = chunk
+    except Error:
+        return b64decode(value)
+
+    del buffer[position:]
+    return bytes(buffer)
+
+
+def blob_stub(value: Union[bytes, bytearray, memoryview]) -> dict:
+    """Returns a reference stub of the binary data."""
+
+    return {"size": len(value), "sha256": sha256(value).hexdigest()}
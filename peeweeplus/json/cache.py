@@ -0,0 +1,194 @@
+"""Caching of serialized records."""
+
+from collections import OrderedDict, defaultdict
+from threading import Lock
+from typing import NamedTuple, Optional, Union
+
+from peewee import Model
+
+from peeweeplus.json.filter import FieldsFilter
+from peeweeplus.json.serialization import serialize
+
+
+__all__ = [
+    "CacheBackend",
+    "CacheInfo",
+    "JSONCache",
+    "LRUBackend",
+    "cached_serialize",
+    "invalidate",
+]
+
+
+class CacheInfo(NamedTuple):
+    """Cache statistics."""
+
+    hits: int
+    misses: int
+    maxsize: Optional[int]
+    currsize: int
+
+
+class CacheBackend:
+    """Interface of storage backends for serialized records.
+
+    Entry keys are tuples whose first item is the record key,
+    i.e. a tuple of the model and the primary key.
+    """
+
+    maxsize: Optional[int] = None
+
+    def __len__(self) -> int:
+        raise NotImplementedError()
+
+    def get(self, key: tuple) -> Optional[dict]:
+        """Returns the cached JSON-ish dict or None."""
+        raise NotImplementedError()
+
+    def set(self, key: tuple, json: dict) -> None:
+        """Stores the JSON-ish dict."""
+        raise NotImplementedError()
+
+    def invalidate(self, record_key: tuple) -> None:
+        """Removes all entries of the respective record."""
+        raise NotImplementedError()
+
+    def clear(self) -> None:
+        """Removes all entries."""
+        raise NotImplementedError()
+
+
+class LRUBackend(CacheBackend):
+    """Thread-safe in-process backend with least recently used eviction."""
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._records = defaultdict(set)
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: tuple) -> Optional[dict]:
+        with self._lock:
+            try:
+                self._entries.move_to_end(key)
+            except KeyError:
+                return None
+
+            return self._entries[key]
+
+    def set(self, key: tuple, json: dict) -> None:
+        with self._lock:
+            self._entries[key] = json
+            self._entries.move_to_end(key)
+            self._records[key[0]].add(key)
+
+            while len(self._entries) > self.maxsize:
+                self._discard(next(iter(self._entries)))
+
+    def invalidate(self, record_key: tuple) -> None:
+        with self._lock:
+            for key in self._records.pop(record_key, ()):
+                self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._records.clear()
+
+    def _discard(self, key: tuple) -> None:
+        """Removes the respective entry."""
+        del self._entries[key]
+        keys = self._records[key[0]]
+        keys.discard(key)
+
+        if not keys:
+            del self._records[key[0]]
+
+
+class JSONCache:
+    """Cache of serialized records keyed by model, primary key,
+    the value of a version field and the serialization arguments.
+
+    The version field, e.g. a timestamp of the last modification,
+    must change on every write to the record, since an outdated
+    record instance must never be served or stored under the key
+    of a newer version.
+    Records with unsaved changes, records without a version value
+    and cascading serializations are not cached.
+    """
+
+    def __init__(self, backend: Optional[CacheBackend] = None, *, version: str):
+        """Sets the backend and the name of the version field."""
+        self.backend = LRUBackend() if backend is None else backend
+        self.version = version
+        self.hits = 0
+        self.misses = 0
+
+    def serialize(
+        self,
+        record: Model,
+        *,
+        null: bool = False,
+        cascade: Union[bool, int] = None,
+        **filters,
+    ) -> dict:
+        """Returns a shallow copy of the cached JSON-ish dict of the
+        record, serializing and caching it on a cache miss.
+        """
+        if (
+            cascade
+            or (primary_key := record._pk) is None
+            or (version := record.__data__.get(self.version)) is None
+            or record.is_dirty()
+        ):
+            return serialize(record, null=null, cascade=cascade, **filters)
+
+        key = (
+            (type(record), primary_key),
+            version,
+            null,
+            FieldsFilter.for_serialization(**filters),
+        )
+
+        if (json := self.backend.get(key)) is not None:
+            self.hits += 1
+            return dict(json)
+
+        self.misses += 1
+        self.backend.set(key, json := serialize(record, null=null, **filters))
+        return dict(json)
+
+    def invalidate(self, record: Model) -> None:
+        """Removes the cached entries of the record."""
+        if (primary_key := record._pk) is not None:
+            self.backend.invalidate((type(record), primary_key))
+
+    def clear(self) -> None:
+        """Removes all entries and resets the statistics."""
+        self.backend.clear()
+        self.hits = self.misses = 0
+
+    def cache_info(self) -> CacheInfo:
+        """Returns the cache statistics."""
+        return CacheInfo(
+            self.hits, self.misses, self.backend.maxsize, len(self.backend)
+        )
+
+
+def cached_serialize(record: Model, **kwargs) -> dict:
+    """Serializes the record using its model's JSON cache, if any."""
+
+    if (cache := getattr(record, "__json_cache__", None)) is None:
+        return serialize(record, **kwargs)
+
+    return cache.serialize(record, **kwargs)
+
+
+def invalidate(record: Model) -> None:
+    """Invalidates the record in its model's JSON cache, if any."""
+
+    if (cache := getattr(record, "__json_cache__", None)) is not None:
+        cache.invalidate(record)
@@ -1,7 +1,9 @@
 """JSON deserialization."""
 
+from contextlib import nullcontext
+from functools import lru_cache
 from ipaddress import IPv4Address, IPv6Address, ip_address
-from typing import Any, Type
+from typing import Any, Callable, Iterable, Iterator, NamedTuple, Optional, Type
 from uuid import UUID
 
 from peewee import BlobField
@@ -14,21 +16,26 @@ from peewee import Field
 from peewee import FloatField
 from peewee import ForeignKeyField
 from peewee import IntegerField
+from peewee import SQL
 from peewee import Model
+from peewee import Select
 from peewee import TimeField
 from peewee import UUIDField
+from peewee import chunked
 
+from peeweeplus.database import get_chunk_size
 from peeweeplus.exceptions import FieldNotNullable
 from peeweeplus.exceptions import FieldValueError
 from peeweeplus.exceptions import InvalidKeys
 from peeweeplus.exceptions import MissingKeyError
 from peeweeplus.exceptions import NonUniqueValue
-from peeweeplus.exceptions import NullError
 from peeweeplus.fields import EnumField
 from peeweeplus.fields import IPAddressField
 from peeweeplus.fields import IPv4AddressField
 from peeweeplus.fields import IPv6AddressField
-from peeweeplus.json.fields import get_json_fields, FieldConverter
+from peeweeplus.json.cache import invalidate
+from peeweeplus.json.fields import get_json_fields, sort_json_fields
+from peeweeplus.json.fields import IN_CHUNK_SIZE, PLAN_CACHE_SIZE, FieldConverter
 from peeweeplus.json.filter import FieldsFilter
 from peeweeplus.json.parsers import parse_blob
 from peeweeplus.json.parsers import parse_char_field
@@ -37,10 +44,20 @@ from peeweeplus.json.parsers import parse_date
 from peeweeplus.json.parsers import parse_datetime
 from peeweeplus.json.parsers import parse_time
 from peeweeplus.json.parsers import parse_enum
+from peeweeplus.querycache import QUERY_CACHE, Param
 from peeweeplus.types import JSON
 
 
-__all__ = ["deserialize", "patch"]
+__all__ = [
+    "DeserializationPlan",
+    "DeserializationStep",
+    "deserialize",
+    "deserialize_many",
+    "get_deserialization_plan",
+    "insert_json",
+    "patch",
+    "save_changes",
+]
 
 
 CONVERTER = FieldConverter(
@@ -64,96 +81,363 @@ CONVERTER = FieldConverter(
 )
 
 
-def get_orm_value(
-    model: Type[Model], key: str, attribute: str, field: Field, json: JSON
-) -> Any:
+class DeserializationStep(NamedTuple):
+    """A pre-resolved deserialization step for a field."""
+
+    key: str
+    attribute: str
+    field: Field
+    parse: Optional[Callable[[Any], Any]]
+    null: bool
+    optional: bool
+    unique: bool
+
+
+class DeserializationPlan(NamedTuple):
+    """Ordered deserialization steps and the keys they consume."""
+
+    steps: tuple[DeserializationStep, ...]
+    keys: frozenset[str]
+
+
+@lru_cache(maxsize=PLAN_CACHE_SIZE)
+def get_deserialization_plan(
+    model: Type[Model], fields_filter: FieldsFilter
+) -> DeserializationPlan:
+    """Returns the deserialization plan of the
+    model's filtered fields in definition order.
+    """
+
+    steps = tuple(
+        DeserializationStep(
+            key,
+            attribute,
+            field,
+            CONVERTER.bind(field),
+            field.null,
+            # On missing key, skip if field is nullable or field has a default.
+            field.null or field.default is not None,
+            field.unique,
+        )
+        for key, attribute, field in sort_json_fields(
+            model, fields_filter.filter(get_json_fields(model))
+        )
+    )
+    return DeserializationPlan(steps, frozenset(step.key for step in steps))
+
+
+CONVERTER.caches.append(get_deserialization_plan)
+
+
+def get_orm_value(model: Type[Model], step: DeserializationStep, json: JSON) -> Any:
     """Returns the appropriate value for the field."""
 
+    if json is None:
+        if not step.null:
+            raise FieldNotNullable(model, step.key, step.attribute, step.field)
+
+        return None
+
+    if step.parse is None:
+        return json
+
     try:
-        return CONVERTER(field, json, check_null=True)
-    except NullError:
-        raise FieldNotNullable(model, key, attribute, field) from None
+        return step.parse(json)
     except (TypeError, ValueError):
-        raise FieldValueError(model, key, attribute, field, json) from None
+        raise FieldValueError(
+            model, step.key, step.attribute, step.field, json
+        ) from None
 
 
 def is_unique(record: Model, field: Field, orm_value: Any) -> bool:
     """Checks whether the value is unique for the field."""
 
+    shape = (orm_value is None, (primary_key := record._pk) is None)
+    rows = QUERY_CACHE.execute(
+        (field.model, field.name, "is_unique", shape),
+        lambda: _select_duplicate(field, *shape),
+        field.model._meta.database,
+        value=orm_value,
+        primary_key=primary_key,
+    )
+    return next(iter(rows), None) is None
+
+
+def _select_duplicate(field: Field, null: bool, new: bool) -> Select:
+    """Selects a record with the field's value, excluding
+    the record with the primary key unless it is new.
+    """
+
     model = field.model
-    select = field == orm_value
+    condition = field.is_null() if null else field == Param("value")
 
-    if (primary_key := record._pk) is not None:
-        pk_field = model._meta.primary_key
-        select &= pk_field != primary_key  # Exclude the model itself.
+    if not new:
+        condition &= model._meta.primary_key != Param("primary_key")
+
+    return model.select(SQL("1")).where(condition).limit(1).tuples()
+
+
+def is_unchanged(record: Model, field: Field, orm_value: Any) -> bool:
+    """Checks whether the record already holds the value for the field."""
 
     try:
-        model.get(select)
-    except model.DoesNotExist:
-        return True
+        return record.__data__[field.name] == orm_value
+    except KeyError:  # Field was not loaded or set.
+        return False
+
+
+def _set_value(
+    record: Model,
+    step: DeserializationStep,
+    json_value: JSON,
+    json: dict,
+    check_unique: bool = True,
+    only_changed: bool = False,
+) -> bool:
+    """Converts the JSON value and sets it on the record.
+    Returns whether the value has been set.
+    """
 
-    return False
+    model = type(record)
+    orm_value = get_orm_value(model, step, json_value)
 
+    if only_changed and is_unchanged(record, step.field, orm_value):
+        return False
 
-def deserialize(
-    model: Type[Model], json: dict, *, strict: bool = True, **filters
+    if check_unique and step.unique and not is_unique(record, step.field, orm_value):
+        raise NonUniqueValue(step.key, json_value)
+
+    try:
+        setattr(record, step.attribute, orm_value)
+    except ValueError:
+        raise FieldValueError(
+            model, step.key, step.attribute, step.field, json
+        ) from None
+
+    return True
+
+
+def _check_keys(plan: DeserializationPlan, json: dict, consumed: int) -> None:
+    """Raises InvalidKeys if the JSON contains keys not consumed by the plan."""
+
+    if consumed < len(json):
+        raise InvalidKeys([key for key in json if key not in plan.keys])
+
+
+def _deserialize(
+    model: Type[Model],
+    plan: DeserializationPlan,
+    json: dict,
+    strict: bool,
+    check_unique: bool = True,
 ) -> Model:
-    """Creates a new record from a JSON-ish dict."""
+    """Creates a new record from a JSON-ish dict using the given plan."""
 
     record = model()
-    fields = get_json_fields(model)
-    json = dict(json)
-    fields_filter = FieldsFilter.for_deserialization(**filters)
+    consumed = 0
 
-    for key, attribute, field in fields_filter.filter(fields):
+    for step in plan.steps:
         try:
-            json_value = json.pop(key)
+            json_value = json[step.key]
         except KeyError:
-            # On missing key, skip if field is nullable or field has a default.
-            if field.null or field.default is not None:
+            if step.optional:
                 continue
 
-            raise MissingKeyError(model, key, attribute, field) from None
+            raise MissingKeyError(model, step.key, step.attribute, step.field) from None
 
-        orm_value = get_orm_value(model, key, attribute, field, json_value)
+        consumed += 1
+        _set_value(record, step, json_value, json, check_unique)
 
-        if field.unique and not is_unique(record, field, orm_value):
-            raise NonUniqueValue(key, json_value)
+    if strict:
+        _check_keys(plan, json, consumed)
 
-        try:
-            setattr(record, attribute, orm_value)
-        except ValueError:
-            raise FieldValueError(model, key, attribute, field, json) from None
+    return record
 
-    if json and strict:
-        raise InvalidKeys(json.keys())
 
-    return record
+def _check_unique(
+    model: Type[Model],
+    plan: DeserializationPlan,
+    batch: list[tuple[Model, dict]],
+    seen: dict[str, set],
+) -> None:
+    """Checks the values of the unique fields of a batch of new records
+    for duplicates within the batch and previously seen values and, with
+    one query per unique field, for conflicts with existing records.
+    """
 
+    pk_field = model._meta.primary_key
 
-def patch(record: Model, json: dict, *, strict: bool = True, **filters) -> None:
-    """Patches an existing record with a JSON-ish dict."""
+    for step in plan.steps:
+        if not step.unique:
+            continue
+
+        records = {}
+        values = seen.setdefault(step.key, set())
+
+        for record, json in batch:
+            if step.key not in json:
+                continue
+
+            value = record.__data__.get(step.field.name)
+
+            # Like SQL's UNIQUE constraint, allow multiple NULLs.
+            if value is not None:
+                if value in values:
+                    raise NonUniqueValue(step.key, json[step.key])
+
+                values.add(value)
+
+            records[value] = (record, json)
+
+        if not records:
+            continue
+
+        condition = step.field << [value for value in records if value is not None]
+
+        if None in records:
+            condition |= step.field.is_null()
+
+        for primary_key, value in (
+            model.select(pk_field, step.field).where(condition).tuples()
+        ):
+            try:
+                record, json = records[value]
+            except KeyError:  # Value matched by the database's collation.
+                raise NonUniqueValue(step.key, value) from None
+
+            if record._pk is None or record._pk != primary_key:
+                raise NonUniqueValue(step.key, json[step.key])
 
-    model = type(record)
-    fields = get_json_fields(model)
-    json = dict(json)
-    fields_filter = FieldsFilter.for_deserialization(**filters)
 
-    for key, attribute, field in fields_filter.filter(fields):
+def deserialize(
+    model: Type[Model], json: dict, *, strict: bool = True, **filters
+) -> Model:
+    """Creates a new record from a JSON-ish dict."""
+
+    return _deserialize(
+        model,
+        get_deserialization_plan(model, FieldsFilter.for_deserialization(**filters)),
+        json,
+        strict,
+    )
+
+
+def deserialize_many(
+    model: Type[Model],
+    jsons: Iterable[dict],
+    *,
+    strict: bool = True,
+    chunk_size: int = IN_CHUNK_SIZE,
+    **filters,
+) -> Iterator[Model]:
+    """Yields new records from JSON-ish dicts.
+
+    Uniqueness is checked per chunk of records with one
+    query per unique field instead of one query per record
+    and unique field. Duplicates among the JSON-ish dicts
+    are detected as well. Chunks are validated before
+    their records are yielded.
+    """
+
+    plan = get_deserialization_plan(model, FieldsFilter.for_deserialization(**filters))
+    check_unique = any(step.unique for step in plan.steps)
+    seen = {}
+
+    for chunk in chunked(jsons, chunk_size):
+        batch = [
+            (_deserialize(model, plan, json, strict, check_unique=False), json)
+            for json in chunk
+        ]
+
+        if check_unique:
+            _check_unique(model, plan, batch, seen)
+
+        yield from (record for record, _ in batch)
+
+
+def patch(
+    record: Model, json: dict, *, strict: bool = True, **filters
+) -> dict[str, Any]:
+    """Patches an existing record with a JSON-ish dict.
+
+    Only values that differ from the record's current values are set,
+    so that unchanged fields are not marked as dirty.
+    Returns the changed attributes and their new values. Pass them to
+    save_changes() to update only the changed columns, since a plain
+    save() writes all columns unless the model sets Meta.only_save_dirty.
+    """
+
+    plan = get_deserialization_plan(
+        type(record), FieldsFilter.for_deserialization(**filters)
+    )
+    changes = {}
+    consumed = 0
+
+    for step in plan.steps:
         try:
-            json_value = json.pop(key)
+            json_value = json[step.key]
         except KeyError:
             continue
 
-        orm_value = get_orm_value(model, key, attribute, field, json_value)
+        consumed += 1
 
-        if field.unique and not is_unique(record, field, orm_value):
-            raise NonUniqueValue(key, json_value)
+        if _set_value(record, step, json_value, json, only_changed=True):
+            changes[step.attribute] = record.__data__.get(step.field.name)
 
-        try:
-            setattr(record, attribute, orm_value)
-        except ValueError:
-            raise FieldValueError(model, key, attribute, field, json) from None
+    if strict:
+        _check_keys(plan, json, consumed)
+
+    if changes:
+        invalidate(record)
+
+    return changes
+
+
+def save_changes(record: Model, changes: dict[str, Any]) -> int:
+    """Saves the changes returned by patch() and returns the number
+    of modified rows. Only the changed columns are updated and the
+    UPDATE is skipped entirely if there are no changes.
+    """
+
+    if not changes:
+        return 0
+
+    return record.save(only=list(changes))
+
+
+def insert_json(
+    model: Type[Model], jsons: Iterable[dict], *, strict: bool = True, **filters
+) -> list[int]:
+    """Creates new records from JSON-ish dicts and inserts them
+    with chunked multi-row INSERTs within one atomic transaction.
+
+    Omitted optional fields are inserted as NULL. The chunk size
+    is derived from the database's max_parameters attribute,
+    if available, and capped by MAX_ROWS. A connection opened for
+    the insert is closed afterwards. Returns the amount of records
+    per chunk.
+    """
+
+    plan = get_deserialization_plan(model, FieldsFilter.for_deserialization(**filters))
+    attributes = {step.attribute for step in plan.steps}
+    fields = [
+        field
+        for field in model._meta.sorted_fields
+        if field in model._meta.defaults or field.name in attributes
+    ]
+    database = model._meta.database
+    chunk_size = get_chunk_size(database, len(fields))
+    records = deserialize_many(model, jsons, strict=strict, **filters)
+    counts = []
+
+    with database.connection_context() if database.is_closed() else nullcontext():
+        with database.atomic():
+            for chunk in chunked(records, chunk_size):
+                rows = [
+                    [record.__data__.get(field.name) for field in fields]
+                    for record in chunk
+                ]
+                model.insert_many(rows, fields=fields).execute()
+                counts.append(len(rows))
 
-    if json and strict:
-        raise InvalidKeys(json.keys())
+    return counts
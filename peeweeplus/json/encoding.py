@@ -0,0 +1,93 @@
+"""Encoding of records to JSON bytes."""
+
+from functools import lru_cache
+from json import dumps
+from typing import Any, Callable, NamedTuple, Type, Union
+
+from peewee import DateField
+from peewee import DateTimeField
+from peewee import Field
+from peewee import Model
+from peewee import TimeField
+
+from peeweeplus.fields import EnumField
+from peeweeplus.json.fields import PLAN_CACHE_SIZE
+from peeweeplus.json.filter import FieldsFilter
+from peeweeplus.json.serialization import CONVERTER
+from peeweeplus.json.serialization import SerializationStep
+from peeweeplus.json.serialization import apply_plan
+from peeweeplus.json.serialization import get_serialization_plan
+
+
+__all__ = ["ENCODER", "STDLIB", "Encoder", "serialize_bytes"]
+
+
+class Encoder(NamedTuple):
+    """A JSON encoder backend.
+
+    The native field types are those whose python values the backend
+    encodes exactly like their serialization converters would, so
+    that the converters can be skipped.
+    """
+
+    dumps: Callable[[Any], bytes]
+    native: tuple[Type[Field], ...] = ()
+
+
+def _stdlib_dumps(json: Any) -> bytes:
+    """Encodes the JSON-ish object using the standard library."""
+
+    return dumps(json, separators=(",", ":")).encode()
+
+
+STDLIB = Encoder(_stdlib_dumps)
+
+try:
+    from orjson import OPT_NON_STR_KEYS, dumps as _orjson_dumps
+except ModuleNotFoundError:
+    ENCODER = STDLIB
+else:
+    ENCODER = ORJSON = Encoder(
+        lambda json: _orjson_dumps(json, option=OPT_NON_STR_KEYS),
+        (DateField, DateTimeField, TimeField, EnumField),
+    )
+    __all__.append("ORJSON")
+
+
+@lru_cache(maxsize=PLAN_CACHE_SIZE)
+def get_encoding_plan(
+    model: Type[Model], fields_filter: FieldsFilter, encoder: Encoder
+) -> tuple[SerializationStep, ...]:
+    """Returns the serialization plan without the
+    converters of the encoder's native field types.
+    """
+
+    return tuple(
+        (
+            step._replace(convert=None)
+            if isinstance(model._meta.fields[step.attribute], encoder.native)
+            else step
+        )
+        for step in get_serialization_plan(model, fields_filter)
+    )
+
+
+CONVERTER.caches.append(get_encoding_plan)
+
+
+def serialize_bytes(
+    record: Model,
+    *,
+    encoder: Encoder = ENCODER,
+    null: bool = False,
+    cascade: Union[bool, int] = None,
+    **filters,
+) -> bytes:
+    """Returns UTF-8 encoded JSON of the record's fields' values."""
+
+    plan = get_encoding_plan(
+        type(record), FieldsFilter.for_serialization(**filters), encoder
+    )
+    return encoder.dumps(
+        apply_plan(record, plan, null=null, cascade=cascade, **filters)
+    )
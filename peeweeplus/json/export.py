@@ -0,0 +1,163 @@
+"""Parallel export of large tables to JSON."""
+
+from concurrent.futures import ProcessPoolExecutor
+from math import ceil
+from multiprocessing import get_context
+from os import cpu_count
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import IO, Optional, Type, Union
+
+from peewee import IntegerField, Model, fn
+
+from peeweeplus.json.serialization import serialize_many
+from peeweeplus.json.streaming import stream_json
+
+
+__all__ = ["export", "export_shards", "get_pk_ranges"]
+
+
+RANGES_PER_PROCESS = 4
+
+
+def get_pk_ranges(model: Type[Model], count: int) -> list[tuple[int, int]]:
+    """Splits the model's integer primary key
+    space into half-open ranges of equal width.
+    """
+
+    if not isinstance(primary_key := model._meta.primary_key, IntegerField):
+        raise TypeError(
+            f"Cannot split {model.__name__} into primary key ranges, "
+            "since it has no integer primary key."
+        )
+
+    lower, upper = model.select(fn.MIN(primary_key), fn.MAX(primary_key)).scalar(
+        as_tuple=True
+    )
+
+    if lower is None:
+        return []
+
+    step = max(1, ceil((upper - lower + 1) / count))
+    return [
+        (start, min(start + step, upper + 1)) for start in range(lower, upper + 1, step)
+    ]
+
+
+def _export_range(
+    model: Type[Model], lower: int, upper: int, path: Path, filters: dict
+) -> Path:
+    """Exports the records of the primary key range as NDJSON to the file.
+    Runs in a worker process with its own database connection.
+    """
+
+    primary_key = model._meta.primary_key
+    select = (
+        model.select()
+        .where((primary_key >= lower) & (primary_key < upper))
+        .order_by(primary_key)
+    )
+
+    try:
+        with path.open("wb") as file:
+            for chunk in stream_json(serialize_many(select, **filters), ndjson=True):
+                file.write(chunk)
+    finally:
+        model._meta.database.close()
+
+    return path
+
+
+def export_shards(
+    model: Type[Model],
+    directory: Union[Path, str],
+    *,
+    processes: Optional[int] = None,
+    ranges: Optional[int] = None,
+    **filters,
+) -> list[Path]:
+    """Exports the model's table as NDJSON shards to the directory
+    using a pool of worker processes, one primary key range per shard.
+
+    The model must be importable by the worker processes, since they
+    are spawned and open their own database connections.
+    Returns the shard files in primary key order.
+    """
+
+    processes = processes or cpu_count() or 1
+    pk_ranges = get_pk_ranges(model, ranges or processes * RANGES_PER_PROCESS)
+    directory = Path(directory)
+    name = model._meta.table_name
+    paths = [
+        directory / f"{name}-{index:05d}.ndjson" for index in range(len(pk_ranges))
+    ]
+
+    with ProcessPoolExecutor(processes, mp_context=get_context("spawn")) as pool:
+        return list(
+            pool.map(
+                _export_range,
+                [model] * len(paths),
+                [lower for lower, _ in pk_ranges],
+                [upper for _, upper in pk_ranges],
+                paths,
+                [filters] * len(paths),
+            )
+        )
+
+
+def _merge(paths: list[Path], file: IO[bytes], ndjson: bool) -> None:
+    """Merges the NDJSON shards into one JSON array or NDJSON file."""
+
+    if not ndjson:
+        file.write(b"[")
+
+    separator = b""
+
+    for path in paths:
+        with path.open("rb") as shard:
+            if ndjson:
+                for line in shard:
+                    file.write(line)
+
+                continue
+
+            for line in shard:
+                file.write(separator)
+                file.write(line.rstrip(b"\n"))
+                separator = b","
+
+    if not ndjson:
+        file.write(b"]")
+
+
+def export(
+    model: Type[Model],
+    file: Union[IO[bytes], Path, str],
+    *,
+    ndjson: bool = False,
+    processes: Optional[int] = None,
+    ranges: Optional[int] = None,
+    **filters,
+) -> None:
+    """Exports the model's table to one file ordered by primary key,
+    either as JSON array or, if ndjson is True, as NDJSON.
+
+    See export_shards() for the parallelization.
+    """
+
+    if not hasattr(file, "write"):
+        with open(file, "wb") as target:
+            return export(
+                model,
+                target,
+                ndjson=ndjson,
+                processes=processes,
+                ranges=ranges,
+                **filters,
+            )
+
+    with TemporaryDirectory() as directory:
+        paths = export_shards(
+            model, directory, processes=processes, ranges=ranges, **filters
+        )
+        return _merge(paths, file, ndjson)
@@ -1,7 +1,8 @@
 """Miscellaneous stuff."""
 
 from functools import cache
-from typing import Any, Iterable, Iterator, NamedTuple, Type
+from inspect import Parameter, signature
+from typing import Any, Callable, Iterable, Iterator, NamedTuple, Optional, Type
 
 from peewee import Field, ForeignKeyField, Model
 
@@ -10,12 +11,20 @@ from peeweeplus.exceptions import NullError
 
 __all__ = [
     "JSONField",
+    "IN_CHUNK_SIZE",
+    "PLAN_CACHE_SIZE",
     "FieldConverter",
     "contains",
     "get_json_fields",
+    "sort_json_fields",
 ]
 
 
+IN_CHUNK_SIZE = 500
+PLAN_CACHE_SIZE = 1024  # Plans per (model, filter) combination.
+POSITIONAL = {Parameter.POSITIONAL_ONLY, Parameter.POSITIONAL_OR_KEYWORD}
+
+
 class JSONField(NamedTuple):
     """JSON field information tuple."""
 
@@ -24,8 +33,67 @@ class JSONField(NamedTuple):
     field: Field
 
 
+class Dispatch(NamedTuple):
+    """A resolved conversion function."""
+
+    function: Optional[Callable[..., Any]]
+    takes_field: bool
+
+
 class FieldConverter(dict):
-    """Maps conversion functions to field classes."""
+    """Maps conversion functions to field classes.
+
+    Conversion functions are either called with the value only or,
+    if they require a second positional parameter, with the value
+    and the field. The function of the most specific field class
+    in the field's MRO is used and cached per field class.
+    Mutations also clear the caches of plans with bound functions.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.caches = []  # lru_cache()d functions that bind functions.
+        self._dispatch = {}
+
+    def __setitem__(self, typ: Type[Field], function: Callable[..., Any]):
+        super().__setitem__(typ, function)
+        self._invalidate()
+
+    def __delitem__(self, typ: Type[Field]):
+        super().__delitem__(typ)
+        self._invalidate()
+
+    def __ior__(self, other):
+        super().__ior__(other)
+        self._invalidate()
+        return self
+
+    def update(self, *args, **kwargs) -> None:
+        super().update(*args, **kwargs)
+        self._invalidate()
+
+    def setdefault(
+        self, typ: Type[Field], function: Optional[Callable[..., Any]] = None
+    ):
+        if typ in self:
+            return self[typ]
+
+        self[typ] = function
+        return function
+
+    def pop(self, *args):
+        function = super().pop(*args)
+        self._invalidate()
+        return function
+
+    def popitem(self) -> tuple[Type[Field], Callable[..., Any]]:
+        item = super().popitem()
+        self._invalidate()
+        return item
+
+    def clear(self) -> None:
+        super().clear()
+        self._invalidate()
 
     def __call__(self, field: Field, value: Any, check_null: bool = False) -> Any:
         """Converts the respective value to the field."""
@@ -36,17 +104,68 @@ class FieldConverter(dict):
 
             return None
 
-        for typ, function in self.items():
-            if isinstance(field, typ):
-                break
-        else:
+        function, takes_field = self.dispatch(type(field))
+
+        if function is None:
             return value
 
-        try:
-            return function(value)
-        except TypeError:
+        if takes_field:
             return function(value, field)
 
+        return function(value)
+
+    def _invalidate(self) -> None:
+        """Clears the dispatch table and the dependent caches."""
+        self._dispatch.clear()
+
+        for cache in self.caches:
+            cache.cache_clear()
+
+    def dispatch(self, typ: Type[Field]) -> Dispatch:
+        """Returns the conversion function for the field class."""
+        try:
+            return self._dispatch[typ]
+        except KeyError:
+            dispatch = self._dispatch[typ] = self._resolve(typ)
+            return dispatch
+
+    def _resolve(self, typ: Type[Field]) -> Dispatch:
+        """Resolves the conversion function for the field class."""
+        for cls in typ.__mro__:
+            if (function := self.get(cls)) is not None:
+                return Dispatch(function, takes_field(function))
+
+        return Dispatch(None, False)
+
+    def bind(self, field: Field) -> Optional[Callable[[Any], Any]]:
+        """Returns a unary conversion function for
+        non-null values of the field, if any.
+        """
+        function, takes_field = self.dispatch(type(field))
+
+        if function is None or not takes_field:
+            return function
+
+        return lambda value: function(value, field)
+
+
+def takes_field(function: Callable[..., Any]) -> bool:
+    """Determines whether the conversion function
+    requires the field as second positional argument.
+    """
+
+    try:
+        parameters = signature(function).parameters.values()
+    except (TypeError, ValueError):  # Some builtins have no signature.
+        return False
+
+    required = [
+        parameter
+        for parameter in parameters
+        if parameter.kind in POSITIONAL and parameter.default is Parameter.empty
+    ]
+    return len(required) > 1
+
 
 def contains(
     iterable: Iterable, key: str, attribute: str, *, default: bool = False
@@ -92,3 +211,12 @@ def _get_json_fields(model: Type[Model]) -> Iterator[JSONField]:
             key = field.column_name
 
         yield JSONField(key, field.name, field)
+
+
+def sort_json_fields(
+    model: Type[Model], json_fields: Iterable[JSONField]
+) -> list[JSONField]:
+    """Sorts the JSON fields by their definition order on the model."""
+
+    order = {attribute: index for index, attribute in enumerate(model._meta.fields)}
+    return sorted(json_fields, key=lambda json_field: order[json_field.attribute])
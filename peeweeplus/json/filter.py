@@ -20,6 +20,7 @@ class FieldsFilter(NamedTuple):
     fk_fields: bool
     autofields: bool
     passwords: bool
+    blob_stubs: bool = False
 
     @classmethod
     def for_deserialization(
@@ -41,11 +42,15 @@ class FieldsFilter(NamedTuple):
         only: Optional[Iterable[str]] = None,
         fk_fields: bool = True,
         autofields: bool = True,
+        blob_stubs: bool = False,
     ) -> FieldsFilter:
-        """Creates the filter from the respective keyword arguments."""
+        """Creates the filter from the respective keyword arguments.
+        If blob_stubs is True, binary data is replaced by a size and
+        SHA-256 reference stub instead of being base64 encoded.
+        """
         skip = frozenset(skip) if skip else frozenset()
         only = frozenset(only) if only else frozenset()
-        return cls(skip, only, fk_fields, autofields, False)
+        return cls(skip, only, fk_fields, autofields, False, blob_stubs)
 
     def filter(self, fields: Iterable[JSONField]) -> Iterator[JSONField]:
         """Applies this filter to the respective fields."""
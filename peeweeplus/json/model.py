@@ -5,38 +5,69 @@ from typing import Callable, Optional
 from peewee import Model
 
 from peeweeplus.fields import PasswordField
-from peeweeplus.json.deserialization import deserialize, patch
+from peeweeplus.json.cache import JSONCache, cached_serialize, invalidate
+from peeweeplus.json.deserialization import deserialize, insert_json, patch
+from peeweeplus.json.encoding import serialize_bytes
 from peeweeplus.json.fields import get_json_fields
 from peeweeplus.json.functions import camel_case
-from peeweeplus.json.serialization import serialize
+from peeweeplus.json.serialization import select_for_json
 
 
 __all__ = ["JSONMixin", "JSONModel"]
 
 
 class JSONMixin:  # pylint: disable=R0903
-    """A JSON serializable and deserializable model mixin."""
+    """A JSON serializable and deserializable model mixin.
+
+    Set __json_cache__ to a JSONCache to cache the output of to_json().
+    Cached entries are invalidated on save() and delete_instance(),
+    so the mixin must precede the model class in the bases.
+    """
+
+    __json_cache__: Optional[JSONCache] = None
 
     get_json_fields = classmethod(get_json_fields)
     from_json = classmethod(deserialize)
+    from_json_many = classmethod(insert_json)
     patch_json = patch
-    to_json = serialize
+    select_for_json = classmethod(select_for_json)
+    to_json = cached_serialize
+    to_json_bytes = serialize_bytes
+
+    def save(self, *args, **kwargs):
+        """Saves the record and invalidates its cached JSON."""
+        try:
+            return super().save(*args, **kwargs)
+        finally:
+            invalidate(self)
 
+    def delete_instance(self, *args, **kwargs):
+        """Deletes the record and invalidates its cached JSON."""
+        invalidate(self)
+        return super().delete_instance(*args, **kwargs)
 
-class JSONModel(Model, JSONMixin):
+
+class JSONModel(JSONMixin, Model):
     """A JSON de-/serializable model."""
 
     __key_formatter__ = camel_case
 
     def __init_subclass__(
-        cls, *args, key_formatter: Optional[Callable[[str], str]] = None, **kwargs
+        cls,
+        *args,
+        key_formatter: Optional[Callable[[str], str]] = None,
+        json_cache: Optional[JSONCache] = None,
+        **kwargs,
     ):
-        """Set an optional key formatter."""
+        """Set an optional key formatter and JSON cache."""
         super().__init_subclass__(*args, **kwargs)
 
         if key_formatter is not None:
             cls.__key_formatter__ = key_formatter
 
+        if json_cache is not None:
+            cls.__json_cache__ = json_cache
+
     def __repr__(self):
         """Returns the service's name."""
         cls = type(self)
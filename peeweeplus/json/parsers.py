@@ -1,6 +1,5 @@
 """Data type parsers."""
 
-from base64 import b64decode
 from datetime import datetime, date, time
 from enum import Enum
 from typing import Union
@@ -8,6 +7,7 @@ from typing import Union
 from peewee import CharField
 
 from peeweeplus.fields.enum import EnumField
+from peeweeplus.json.blob import decode_blob
 
 
 __all__ = [
@@ -75,7 +75,7 @@ def parse_blob(value: Union[bytes, str]) -> bytes:
     if isinstance(value, bytes):
         return value
 
-    return b64decode(value)
+    return decode_blob(value)
 
 
 def parse_enum(value: Union[Enum, str], field: EnumField) -> Enum:
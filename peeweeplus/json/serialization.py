@@ -1,27 +1,45 @@
 """JSON serialization."""
 
-from base64 import b64encode
+from collections import defaultdict
 from contextlib import suppress
+from functools import lru_cache
+from typing import Any, Callable, Iterable, Iterator, NamedTuple, Optional, Type
 from typing import Union
 
 from peewee import BlobField
 from peewee import DateField
 from peewee import DateTimeField
 from peewee import DecimalField
+from peewee import Field
+from peewee import ForeignKeyField
 from peewee import Model
+from peewee import ModelSelect
 from peewee import TimeField
 from peewee import UUIDField
+from peewee import chunked
 from peeweeplus.fields import EnumField, IPv4AddressField, IPv6AddressField
-from peeweeplus.json.fields import get_json_fields, FieldConverter
+from peeweeplus.fields import HTMLCharField, HTMLTextField
+from peeweeplus.json.blob import blob_stub, encode_blob
+from peeweeplus.json.fields import get_json_fields, sort_json_fields
+from peeweeplus.json.fields import IN_CHUNK_SIZE, PLAN_CACHE_SIZE, FieldConverter
 from peeweeplus.json.filter import FieldsFilter
 
 
-__all__ = ["serialize"]
+__all__ = [
+    "SerializationStep",
+    "apply_plan",
+    "get_serialization_plan",
+    "prefetch_related",
+    "select_for_json",
+    "serialize",
+    "serialize_all",
+    "serialize_many",
+]
 
 
 CONVERTER = FieldConverter(
     {
-        BlobField: b64encode,
+        BlobField: encode_blob,
         DecimalField: float,
         DateField: lambda value: value.isoformat(),
         DateTimeField: lambda value: value.isoformat(),
@@ -34,6 +52,44 @@ CONVERTER = FieldConverter(
 )
 
 
+class SerializationStep(NamedTuple):
+    """A pre-resolved serialization step for a field."""
+
+    key: str
+    attribute: str
+    convert: Optional[Callable[[Any], Any]]
+
+
+def _get_converter(
+    field: Field, fields_filter: FieldsFilter
+) -> Optional[Callable[[Any], Any]]:
+    """Returns the unary converter for the field."""
+
+    if fields_filter.blob_stubs and isinstance(field, BlobField):
+        return blob_stub
+
+    return CONVERTER.bind(field)
+
+
+@lru_cache(maxsize=PLAN_CACHE_SIZE)
+def get_serialization_plan(
+    model: Type[Model], fields_filter: FieldsFilter
+) -> tuple[SerializationStep, ...]:
+    """Returns the serialization steps of the
+    model's filtered fields in definition order.
+    """
+
+    return tuple(
+        SerializationStep(key, attribute, _get_converter(field, fields_filter))
+        for key, attribute, field in sort_json_fields(
+            model, fields_filter.filter(get_json_fields(model))
+        )
+    )
+
+
+CONVERTER.caches.append(get_serialization_plan)
+
+
 def _next(cascade: Union[bool, int]) -> Union[bool, int]:
     """Returns the next cascading step."""
 
@@ -66,13 +122,29 @@ def serialize(
 ) -> dict:
     """Returns a JSON-ish dict with the record's fields' values."""
 
-    model = type(record)
-    fields = get_json_fields(model)
-    fields_filter = FieldsFilter.for_serialization(**filters)
+    plan = get_serialization_plan(
+        type(record), FieldsFilter.for_serialization(**filters)
+    )
+    return apply_plan(record, plan, null=null, cascade=cascade, **filters)
+
+
+def apply_plan(
+    record: Model,
+    plan: tuple[SerializationStep, ...],
+    *,
+    null: bool = False,
+    cascade: Union[bool, int] = None,
+    **filters,
+) -> dict:
+    """Returns a JSON-ish dict of the record's fields' values
+    according to the respective serialization plan.
+    """
+
     json = {}
 
-    for key, attribute, field in fields_filter.filter(fields):
-        value = CONVERTER(field, getattr(record, attribute), check_null=False)
+    for key, attribute, convert in plan:
+        if (value := getattr(record, attribute)) is not None and convert is not None:
+            value = convert(value)
 
         if not null and value is None:
             continue
@@ -83,3 +155,162 @@ def serialize(
         json[key] = value
 
     return json
+
+
+def select_for_json(model: Type[Model], **filters) -> ModelSelect:
+    """Selects the primary key and only those columns of the
+    model that are serialized with the respective filters.
+    """
+
+    plan = get_serialization_plan(model, FieldsFilter.for_serialization(**filters))
+    attributes = [attribute for _, attribute, _ in plan]
+    primary_keys = [
+        field.name
+        for field in model._meta.get_primary_keys()
+        if field.name not in attributes
+    ]
+    fields = [model._meta.fields[name] for name in primary_keys + attributes]
+    return model.select(*fields)
+
+
+def _get_row_converter(
+    field: Field, convert: Optional[Callable[[Any], Any]]
+) -> Optional[Callable[[Any], Any]]:
+    """Returns the converter for raw column values of the field."""
+
+    if isinstance(field, (HTMLCharField, HTMLTextField)):
+        return field.clean_func  # Mimic HTMLTextAccessor.__get__().
+
+    return convert
+
+
+def serialize_many(
+    select: ModelSelect, *, null: bool = False, **filters
+) -> Iterator[dict]:
+    """Yields JSON-ish dicts of the selected records' fields' values
+    from raw result tuples without instantiating model objects.
+
+    Foreign keys are always serialized as their raw IDs.
+    """
+
+    model = select.model
+    plan = get_serialization_plan(model, FieldsFilter.for_serialization(**filters))
+    fields = [model._meta.fields[attribute] for _, attribute, _ in plan]
+    steps = [
+        (key, _get_row_converter(field, convert))
+        for (key, _, convert), field in zip(plan, fields)
+    ]
+
+    for row in select.select(*fields).tuples().iterator():
+        json = {}
+
+        for (key, convert), value in zip(steps, row):
+            if value is not None and convert is not None:
+                value = convert(value)
+
+            if not null and value is None:
+                continue
+
+            json[key] = value
+
+        yield json
+
+
+def _get_foreign_keys(
+    model: Type[Model], fields_filter: FieldsFilter
+) -> dict[Field, list[ForeignKeyField]]:
+    """Returns the serialized, lazy loading foreign
+    keys of the model grouped by their related field.
+    """
+
+    foreign_keys = defaultdict(list)
+
+    for _, attribute, _ in get_serialization_plan(model, fields_filter):
+        field = model._meta.fields[attribute]
+
+        if isinstance(field, ForeignKeyField) and field.lazy_load:
+            foreign_keys[field.rel_field].append(field)
+
+    return foreign_keys
+
+
+def _load_related(
+    model: Type[Model], records: list[Model], fields_filter: FieldsFilter
+) -> Iterator[Model]:
+    """Loads the related records of the records'
+    foreign keys with one query per related field
+    and yields the related records.
+    """
+
+    for rel_field, foreign_keys in _get_foreign_keys(model, fields_filter).items():
+        ids = {
+            value
+            for record in records
+            for foreign_key in foreign_keys
+            if foreign_key.name not in record.__rel__
+            and (value := record.__data__.get(foreign_key.name)) is not None
+        }
+        related = {
+            getattr(rel_record, rel_field.name): rel_record
+            for chunk in chunked(ids, IN_CHUNK_SIZE)
+            for rel_record in rel_field.model.select().where(rel_field << chunk)
+        }
+
+        for record in records:
+            for foreign_key in foreign_keys:
+                if (value := record.__data__.get(foreign_key.name)) in related:
+                    record.__rel__.setdefault(foreign_key.name, related[value])
+
+                if isinstance(
+                    rel_record := record.__rel__.get(foreign_key.name), Model
+                ):
+                    yield rel_record
+
+
+def prefetch_related(
+    records: Iterable[Model], cascade: Union[bool, int] = None, **filters
+) -> None:
+    """Loads the related records that serialize() would lazily load
+    for the respective records with one query per related field and
+    cascading level and caches them on the records.
+    """
+
+    fields_filter = FieldsFilter.for_serialization(**filters)
+    models = defaultdict(list)
+
+    for record in records:
+        models[type(record)].append(record)
+
+    while models:
+        related = {}
+
+        for model, group in models.items():
+            for rel_record in _load_related(model, group, fields_filter):
+                related[id(rel_record)] = rel_record
+
+        if not cascade:
+            return
+
+        cascade = _next(cascade)
+        models = defaultdict(list)
+
+        for rel_record in related.values():
+            if hasattr(rel_record, "to_json"):
+                models[type(rel_record)].append(rel_record)
+
+
+def serialize_all(
+    records: Iterable[Model],
+    *,
+    null: bool = False,
+    cascade: Union[bool, int] = None,
+    **filters,
+) -> list[dict]:
+    """Returns JSON-ish dicts of the respective records
+    with their related records loaded in batches.
+    """
+
+    prefetch_related(records := list(records), cascade, **filters)
+    return [
+        serialize(record, null=null, cascade=cascade, **filters) for record in records
+    ]
@@ -0,0 +1,80 @@
+"""Streaming JSON encoding of large record sets."""
+
+from json import JSONEncoder
+from typing import Iterable, Iterator, Union
+
+from peewee import Model, Select
+
+from peeweeplus.json.serialization import serialize
+
+
+__all__ = ["stream_json"]
+
+
+CHUNK_SIZE = 64 * 1024
+ENCODER = JSONEncoder(separators=(",", ":"))
+
+
+def _get_items(records: Union[Select, Iterable[Union[Model, dict]]]) -> Iterable:
+    """Returns an iterable over the records that does not cache results."""
+
+    if isinstance(records, Select):
+        return records.iterator()
+
+    return records
+
+
+def _encode_items(
+    records: Union[Select, Iterable[Union[Model, dict]]],
+    encoder: JSONEncoder,
+    **kwargs,
+) -> Iterator[str]:
+    """Yields the encoded JSON objects of the respective records."""
+
+    for item in _get_items(records):
+        if isinstance(item, Model):
+            item = serialize(item, **kwargs)
+
+        yield encoder.encode(item)
+
+
+def stream_json(
+    records: Union[Select, Iterable[Union[Model, dict]]],
+    *,
+    ndjson: bool = False,
+    chunk_size: int = CHUNK_SIZE,
+    encoder: JSONEncoder = ENCODER,
+    **kwargs,
+) -> Iterator[bytes]:
+    """Yields UTF-8 encoded chunks of a JSON array or, if ndjson is True,
+    of newline-delimited JSON objects of the respective records.
+
+    Records may be model instances, which are serialized using the
+    keyword arguments of serialize(), or already serialized dicts.
+    Each chunk is at least chunk_size bytes long, except for the last one.
+    """
+
+    separator = "\n" if ndjson else ","
+    buffer = [] if ndjson else ["["]
+    size = len(buffer)
+
+    for index, text in enumerate(_encode_items(records, encoder, **kwargs)):
+        if ndjson:
+            buffer.append(text)
+            buffer.append(separator)
+        else:
+            if index:
+                buffer.append(separator)
+
+            buffer.append(text)
+
+        if (size := size + len(text) + 1) >= chunk_size:
+            yield "".join(buffer).encode()
+            buffer.clear()
+            size = 0
+
+    if not ndjson:
+        buffer.append("]")
+
+    if buffer:
+        yield "".join(buffer).encode()
@@ -0,0 +1,173 @@
+"""Caching of compiled SQL per query shape."""
+
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Callable, Hashable, NamedTuple, Optional, Type
+
+from peewee import Database, Model, Node, Query, SelectBase
+
+
+__all__ = [
+    "CompiledQuery",
+    "Param",
+    "QueryCache",
+    "QueryCacheInfo",
+    "QUERY_CACHE",
+    "get_by_id",
+]
+
+
+class Binding(NamedTuple):
+    """A named parameter and the converter of its context."""
+
+    name: str
+    converter: Optional[Callable[[Any], Any]]
+
+    def bind(self, values: dict[str, Any]) -> Any:
+        """Returns the converted value."""
+        if isinstance(value := values[self.name], Model):
+            value = value._pk
+
+        if self.converter is None:
+            return value
+
+        return self.converter(value)
+
+
+class Param(Node):
+    """A named parameter that is bound on execution."""
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __sql__(self, ctx):
+        return ctx.value(Binding(self.name, ctx.state.converter), converter=False)
+
+
+class CompiledQuery(NamedTuple):
+    """A query's SQL and parameters which may contain bindings."""
+
+    query: Query
+    sql: str
+    params: list
+
+    def bind(self, values: dict[str, Any]) -> list:
+        """Returns the parameters with the values bound."""
+        return [
+            param.bind(values) if type(param) is Binding else param
+            for param in self.params
+        ]
+
+    def execute(self, values: dict[str, Any]) -> Any:
+        """Executes the query with the values bound and returns
+        what the query's execute() would return.
+        """
+        database = self.query._database
+        cursor = database.execute_sql(self.sql, self.bind(values))
+
+        if isinstance(self.query, SelectBase):
+            return self.query._get_cursor_wrapper(cursor)
+
+        return self.query.handle_result(database, cursor)
+
+
+class QueryCacheInfo(NamedTuple):
+    """Query cache statistics."""
+
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+    @property
+    def hit_rate(self) -> float:
+        """Returns the ratio of hits to lookups."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class QueryCache:
+    """Thread-safe LRU cache of compiled queries keyed by query shape.
+
+    A query shape is identified by a hashable key, e.g. a tuple of the
+    model and a name, and built by a callable returning the query with
+    Param() nodes in place of varying values. The SQL is generated
+    once per shape and database and only the parameters are bound on
+    execution. Pass the model's current database, i.e. _meta.database,
+    so that rebinding the model, e.g. with bind_ctx(), is respected.
+    """
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = Lock()
+
+    def compile(
+        self, key: Hashable, build: Callable[[], Query], database: Database
+    ) -> CompiledQuery:
+        """Returns the compiled query of the respective shape,
+        which is bound to and executed on the database.
+        """
+        with self._lock:
+            try:
+                self._entries.move_to_end(key := (key, database))
+            except KeyError:
+                self.misses += 1
+            else:
+                self.hits += 1
+                return self._entries[key]
+
+        query = build().bind(database)
+        sql, params = database.get_sql_context().sql(query).query()
+        compiled = CompiledQuery(query, sql, params)
+
+        with self._lock:
+            self._entries[key] = compiled
+
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+        return compiled
+
+    def execute(
+        self,
+        key: Hashable,
+        build: Callable[[], Query],
+        database: Database,
+        **values,
+    ) -> Any:
+        """Executes the query of the respective shape with the values."""
+        return self.compile(key, build, database).execute(values)
+
+    def clear(self) -> None:
+        """Removes all entries and resets the statistics."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def cache_info(self) -> QueryCacheInfo:
+        """Returns the cache statistics."""
+        return QueryCacheInfo(self.hits, self.misses, self.maxsize, len(self._entries))
+
+
+QUERY_CACHE = QueryCache()
+
+
+def get_by_id(model: Type[Model], primary_key: Any) -> Model:
+    """Returns the record with the primary key using the query cache."""
+
+    for record in QUERY_CACHE.execute(
+        (model, "get_by_id"),
+        lambda: model.select()
+        .where(model._meta.primary_key == Param("primary_key"))
+        .limit(1),
+        model._meta.database,
+        primary_key=primary_key,
+    ):
+        return record
+
+    raise model.DoesNotExist(
+        f"{model.__name__} with primary key {primary_key!r} does not exist."
+    )
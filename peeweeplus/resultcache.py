@@ -0,0 +1,241 @@
+"""Caching of query results of selected tables."""
+
+from collections import OrderedDict, defaultdict
+from functools import lru_cache
+from re import IGNORECASE, compile as compile_regex
+from threading import Lock
+from time import monotonic
+from typing import Any, Callable, Iterable, NamedTuple, Optional, Type, Union
+
+from peewee import Model
+
+
+__all__ = ["ResultCache", "ResultCacheInfo", "Statement", "parse_statement"]
+
+
+NAME = r'(?:`[^`]+`|"[^"]+"|\w+)'  # Backtick-quoted, double-quoted or unquoted.
+TABLE = compile_regex(
+    r"\b(?:FROM|JOIN|INTO|UPDATE|TABLE)\s+"
+    r"(?:(?:LOW_PRIORITY|DELAYED|HIGH_PRIORITY|QUICK|IGNORE)\s+)*"
+    rf"(?:{NAME}\.)?({NAME})",
+    IGNORECASE,
+)
+TRANSACTION_CONTROL = ("BEGIN", "COMMIT", "RELEASE", "ROLLBACK", "SAVEPOINT", "START")
+
+
+class Statement(NamedTuple):
+    """Kind of an SQL statement and the tables it refers to."""
+
+    select: bool
+    tables: frozenset[str]
+
+
+@lru_cache(maxsize=4096)
+def parse_statement(sql: str) -> Statement:
+    """Returns the kind of the SQL statement and its tables."""
+
+    return Statement(
+        sql.lstrip().upper().startswith("SELECT"),
+        frozenset(name.strip('`"') for name in TABLE.findall(sql)),
+    )
+
+
+class ResultCacheInfo(NamedTuple):
+    """Result cache statistics."""
+
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+    @property
+    def hit_rate(self) -> float:
+        """Returns the ratio of hits to lookups."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class Entry(NamedTuple):
+    """A cached query result."""
+
+    description: tuple
+    rows: tuple
+    tables: frozenset[str]
+    expires: float
+
+
+class CachedCursor:
+    """Read-only cursor over a cached query result."""
+
+    lastrowid = None
+
+    def __init__(self, entry: Entry):
+        self.description = entry.description
+        self.rowcount = len(entry.rows)
+        self._rows = entry.rows
+        self._index = 0
+
+    def __iter__(self):
+        return iter(self.fetchone, None)
+
+    def fetchone(self) -> Optional[tuple]:
+        """Returns the next row or None."""
+        try:
+            row = self._rows[self._index]
+        except IndexError:
+            return None
+
+        self._index += 1
+        return row
+
+    def fetchmany(self, size: int = 1) -> list[tuple]:
+        """Returns the next rows."""
+        rows = self._rows[self._index : self._index + size]
+        self._index += len(rows)
+        return list(rows)
+
+    def fetchall(self) -> list[tuple]:
+        """Returns the remaining rows."""
+        rows, self._index = self._rows[self._index :], len(self._rows)
+        return list(rows)
+
+    def close(self) -> None:
+        """Discards the remaining rows."""
+        self._index = len(self._rows)
+
+
+class ResultCache:
+    """Thread-safe LRU cache of select results keyed by SQL and
+    parameters, limited to selects on the respective tables only.
+
+    Entries are tagged with their tables and invalidated by writes to
+    any of them, see MySQLDatabase.execute_sql().
+    Entries expire after ttl seconds, if set.
+    """
+
+    def __init__(
+        self,
+        tables: Iterable[Union[str, Type[Model]]],
+        *,
+        maxsize: int = 1024,
+        ttl: Optional[float] = None,
+    ):
+        self.tables = frozenset(
+            table if isinstance(table, str) else table._meta.table_name
+            for table in tables
+        )
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._tags = defaultdict(set)
+        self._generations = defaultdict(int)
+        self._lock = Lock()
+
+    def get_tables(self, sql: str) -> Statement:
+        """Returns the kind of the statement and its cached tables.
+        The tables are empty for selects that refer to other tables
+        and include all cached tables for other statements whose
+        tables are unknown, except for transaction control.
+        """
+        select, tables = parse_statement(sql)
+
+        if select and not tables <= self.tables:
+            return Statement(select, frozenset())
+
+        if (
+            not select
+            and not tables
+            and not sql.lstrip().upper().startswith(TRANSACTION_CONTROL)
+        ):
+            return Statement(select, self.tables)
+
+        return Statement(select, tables & self.tables)
+
+    def execute(
+        self,
+        function: Callable[[], Any],
+        sql: str,
+        params: Optional[Iterable],
+        tables: frozenset[str],
+    ) -> Any:
+        """Returns a cursor over the cached result or executes the
+        select by calling the function and caches its result.
+        """
+        try:
+            hash(key := (sql, tuple(params or ())))
+        except TypeError:
+            return function()
+
+        with self._lock:
+            if (entry := self._entries.get(key)) is not None:
+                if self.ttl is None or entry.expires > monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return CachedCursor(entry)
+
+                self._discard(key)
+
+            self.misses += 1
+            generations = [self._generations[table] for table in tables]
+
+        cursor = function()
+        entry = Entry(
+            cursor.description,
+            tuple(cursor.fetchall()),
+            tables,
+            monotonic() + (self.ttl or 0),
+        )
+
+        with self._lock:
+            # Do not cache results that may predate a concurrent write.
+            if generations == [self._generations[table] for table in tables]:
+                self._store(key, entry)
+
+        return CachedCursor(entry)
+
+    def invalidate(self, tables: Iterable[str]) -> None:
+        """Removes the entries of the respective tables."""
+        with self._lock:
+            for table in tables:
+                self._generations[table] += 1
+
+                for key in list(self._tags.get(table, ())):
+                    self._discard(key)
+
+    def clear(self) -> None:
+        """Removes all entries and resets the statistics."""
+        with self._lock:
+            for table in self._tags:
+                self._generations[table] += 1
+
+            self._entries.clear()
+            self._tags.clear()
+            self.hits = self.misses = 0
+
+    def cache_info(self) -> ResultCacheInfo:
+        """Returns the cache statistics."""
+        return ResultCacheInfo(
+            self.hits, self.misses, self.maxsize, len(self._entries)
+        )
+
+    def _store(self, key: tuple, entry: Entry) -> None:
+        """Stores the entry and evicts the least recently used ones."""
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+
+        for table in entry.tables:
+            self._tags[table].add(key)
+
+        while len(self._entries) > self.maxsize:
+            self._discard(next(iter(self._entries)))
+
+    def _discard(self, key: tuple) -> None:
+        """Removes the respective entry."""
+        for table in self._entries.pop(key).tables:
+            keys = self._tags[table]
+            keys.discard(key)
+
+            if not keys:
+                del self._tags[table]
@@ -1,13 +1,34 @@
 """Transactions for adding and deleting multiple records in one action."""
 
+from __future__ import annotations
+
 from collections import deque
 from contextlib import ExitStack
-from typing import Iterable, NamedTuple
+from itertools import islice
+from logging import getLogger
+from time import perf_counter
+from typing import Any, Callable, Iterable, NamedTuple, Optional, Sequence, Type
+from typing import Union
+
+from peewee import Case, Database, DatabaseProxy, ForeignKeyField, Model
+from peewee import MySQLDatabase, chunked
+
+from peeweeplus.database import get_chunk_size
+from peeweeplus.json.cache import invalidate
+from peeweeplus.json.model import JSONMixin, JSONModel
 
-from peewee import Database, Model
 
+__all__ = ["Progress", "Transaction", "sort_items"]
 
-__all__ = ["Transaction"]
+
+BATCHED = {"insert", "update", "delete"}
+LOGGER = getLogger(__file__)
+PLAIN_SAVES = {Model.save, JSONMixin.save, JSONModel.save}
+PLAIN_DELETES = {
+    Model.delete_instance,
+    JSONMixin.delete_instance,
+    JSONModel.delete_instance,
+}
 
 
 class TransactionItem(NamedTuple):
@@ -17,12 +38,27 @@ class TransactionItem(NamedTuple):
     record: Model
 
 
+class Progress(NamedTuple):
+    """Progress of a chunked commit."""
+
+    items: int  # Items committed so far, i.e. the checkpoint.
+    total: int
+    chunk_items: int
+    chunk_seconds: float
+    items_per_second: float
+
+
 class AtomicTransaction(ExitStack):
-    """Context manager for atomic transactions."""
+    """Context manager for atomic transactions.
 
-    def __init__(self, databases: Iterable[Database]):
+    Nested transactions are savepoints and
+    must not close the databases on exit.
+    """
+
+    def __init__(self, databases: Iterable[Database], close: bool = True):
         super().__init__()
         self.databases = databases
+        self.close_databases = close
 
     def __enter__(self):
         stack = super().__enter__()
@@ -35,19 +71,81 @@ class AtomicTransaction(ExitStack):
     def __exit__(self, exc_type, exc_val, exc_tb):
         result = super().__exit__(exc_type, exc_val, exc_tb)
 
+        if not self.close_databases:
+            return result
+
         for database in self.databases:
             database.close()
 
         return result
 
 
+class Batch(NamedTuple):
+    """Consecutive records of one model written by the same kind of statement."""
+
+    model: Type[Model]
+    operation: str  # insert, update, delete or one of the record methods.
+    fields: frozenset[str]
+    records: list[Model]
+    keys: set[tuple]
+    references: set[tuple]
+
+    @classmethod
+    def start(cls, key: tuple, record: Model) -> Batch:
+        """Starts a new batch with the record."""
+        batch = cls(*key, [], set(), set())
+        batch.add(record)
+        return batch
+
+    def add(self, record: Model) -> bool:
+        """Adds the record unless it is already included, refers to a record
+        of the batch or, when deleting, is referred to by a record of the
+        batch, since foreign keys may be checked row by row.
+        Returns whether it was added.
+        """
+        if self.operation not in BATCHED:
+            self.records.append(record)
+            return True
+
+        keys, references = _get_keys(record), _get_references(record)
+
+        if (
+            keys & self.keys
+            or references & self.keys
+            or (self.operation == "delete" and keys & self.references)
+        ):
+            return False
+
+        self.records.append(record)
+        self.keys.update(keys)
+        self.references.update(references)
+        return True
+
+    def execute(self) -> None:
+        """Writes the records."""
+        if self.operation == "insert":
+            return _insert(self.model, self.records, self.fields)
+
+        if self.operation == "update":
+            return _update(self.model, self.records, self.fields)
+
+        if self.operation == "delete":
+            return _delete(self.model, self.records)
+
+        for record in self.records:
+            getattr(record, self.operation)()
+
+        return None
+
+
 class Transaction(deque):
     """A Transaction."""
 
     def __init__(self):
-        """Sets the primary record."""
+        """Sets the primary record and the checkpoint."""
         super().__init__()
         self.primary = None
+        self.checkpoint = 0
 
     def __getattr__(self, attr):
         """Delegates to the primary record."""
@@ -79,11 +177,459 @@ class Transaction(deque):
 
         return self.append(item)
 
-    def commit(self):
-        """Saves the records or sub-transactions."""
-        with AtomicTransaction(self.databases):
-            for item in self:
-                if item.delete:
-                    item.record.delete_instance()
-                else:
-                    item.record.save()
+    def commit(
+        self,
+        *,
+        chunk_size: Optional[int] = None,
+        atomic: bool = True,
+        progress: Optional[Callable[[Progress], Any]] = None,
+        start: int = 0,
+        sort: bool = False,
+    ):
+        """Saves the records or sub-transactions.
+
+        Consecutive items of the same model and operation are written
+        in batches, i.e. new records by multi-row inserts on MySQL and
+        databases with returning_clause, existing records by bulk
+        updates and deletions by DELETE ... IN, while the order of the
+        items is kept.
+        Records of models with custom save() or delete_instance()
+        methods are still saved and deleted one by one.
+
+        If chunk_size is set, the items are written in chunks, each in a
+        savepoint of one transaction or, if atomic is False, in its own
+        transaction. The progress callback is called after each chunk.
+        In the non-atomic mode, the checkpoint attribute holds the
+        number of committed items, so that a failed commit can be
+        resumed by passing it as start.
+
+        If sort is True, the items are ordered by foreign key
+        dependencies instead of by the order of adding, see sort_items().
+        Deletions then follow the saves, unless the deleted records are
+        replaced by saved records with the same unique values.
+        """
+        items = sort_items(self) if sort else self
+
+        if chunk_size is None:
+            with AtomicTransaction(self.databases):
+                return _write(islice(items, start, None))
+
+        if not atomic:
+            return self._commit_chunks(items, chunk_size, start, False, progress)
+
+        snapshot = _snapshot(islice(items, start, None))
+
+        try:
+            with AtomicTransaction(self.databases):
+                return self._commit_chunks(items, chunk_size, start, True, progress)
+        except BaseException:
+            _restore(snapshot)
+            raise
+
+    def _commit_chunks(
+        self,
+        items: Sequence[TransactionItem],
+        chunk_size: int,
+        start: int,
+        savepoints: bool,
+        progress: Optional[Callable[[Progress], Any]],
+    ) -> None:
+        """Writes the items in chunks in savepoints or transactions."""
+        self.checkpoint = start
+        begin = perf_counter()
+
+        for chunk in chunked(islice(items, start, None), chunk_size):
+            chunk_begin = perf_counter()
+            databases = {item.record._meta.database for item in chunk}
+            snapshot = None if savepoints else _snapshot(chunk)
+
+            try:
+                with AtomicTransaction(databases, close=not savepoints):
+                    _write(chunk)
+            except BaseException:
+                if snapshot is not None:
+                    _restore(snapshot)
+
+                raise
+
+            self.checkpoint += len(chunk)
+
+            if progress is not None:
+                end = perf_counter()
+                progress(
+                    Progress(
+                        self.checkpoint,
+                        len(items),
+                        len(chunk),
+                        end - chunk_begin,
+                        (self.checkpoint - start) / (end - begin),
+                    )
+                )
+
+
+def sort_items(items: Iterable[TransactionItem]) -> list[TransactionItem]:
+    """Orders the items by the foreign keys between their models.
+
+    Saves come first, with parent models before child models, followed
+    by deletions, with child models before parent models, e.g. to delete
+    a parent whose children have been moved to another one. Deletions of
+    records that share a unique value with a saved record of the same
+    model, i.e. that are replaced by it, precede the saves along with
+    the deletions of their child models instead.
+    Items of the same model are grouped and keep their relative order,
+    so they can be written in batches. Self-references are left to that
+    order. If the models' foreign keys form a cycle, the items keep
+    their order.
+    """
+
+    items = list(items)
+
+    if not all(isinstance(item.record, Model) for item in items):
+        LOGGER.debug("Sub-transactions, keeping the order of items.")
+        return items
+
+    parents = _get_parents(dict.fromkeys(type(item.record) for item in items))
+
+    if (models := _sort_models(parents)) is None:
+        LOGGER.debug("Foreign keys form a cycle, keeping the order of items.")
+        return items
+
+    rank = {model: index for index, model in enumerate(models)}
+    replaced = _get_replaced(items)
+    origins = {type(item.record) for item in items if id(item) in replaced}
+    children = set()
+
+    for model in models:
+        if parents[model] & (origins | children):
+            children.add(model)
+
+    saves, early, late = [], [], []
+
+    for item in items:
+        if not item.delete:
+            saves.append(item)
+        elif id(item) in replaced or type(item.record) in children:
+            early.append(item)
+        else:
+            late.append(item)
+
+    saves.sort(key=lambda item: rank[type(item.record)])
+    early.sort(key=lambda item: -rank[type(item.record)])
+    late.sort(key=lambda item: -rank[type(item.record)])
+    return early + saves + late
+
+
+def _get_replaced(items: list[TransactionItem]) -> set[int]:
+    """Returns the IDs of the deletions of records that share
+    a unique value with a saved record of the same model.
+    """
+
+    replaced = set()
+
+    for model in {type(item.record) for item in items if item.delete}:
+        saved = [i.record for i in items if not i.delete and type(i.record) is model]
+        deleted = [i for i in items if i.delete and type(i.record) is model]
+
+        for names in _get_unique_keys(model) if saved else ():
+            values = {_get_values(record, names) for record in saved} - {None}
+            replaced.update(
+                id(item)
+                for item in deleted
+                if _get_values(item.record, names) in values
+            )
+
+    return replaced
+
+
+def _get_unique_keys(model: Type[Model]) -> list[tuple[str, ...]]:
+    """Returns the names of the fields of the unique constraints."""
+
+    keys = [(field.name,) for field in model._meta.sorted_fields if field.unique]
+
+    for index in model._meta.indexes:
+        if isinstance(index, tuple) and index[1]:  # (field names, unique)
+            keys.append(tuple(index[0]))
+
+    return keys
+
+
+def _get_values(record: Model, names: tuple[str, ...]) -> Optional[tuple]:
+    """Returns the record's values of the fields or None if any
+    of them is NULL, since NULLs do not violate unique constraints.
+    """
+
+    values = tuple(record.__data__.get(name) for name in names)
+    return None if None in values else values
+
+
+def _get_parents(models: dict[Type[Model], None]) -> dict[Type[Model], set]:
+    """Returns the models referenced by each model among the
+    models, except for the model itself.
+    """
+
+    return {
+        model: {
+            field.rel_model
+            for field in model._meta.fields.values()
+            if isinstance(field, ForeignKeyField)
+            and field.rel_model in models
+            and field.rel_model is not model
+        }
+        for model in models
+    }
+
+
+def _sort_models(parents: dict[Type[Model], set]) -> Optional[list[Type[Model]]]:
+    """Sorts the models topologically into levels of parents before
+    children, each level by first occurrence. Returns None on cycles.
+    """
+
+    parents = {model: set(refs) for model, refs in parents.items()}
+    order = []
+
+    while parents:
+        if not (ready := [model for model, refs in parents.items() if not refs]):
+            return None
+
+        for model in ready:
+            order.append(model)
+            del parents[model]
+
+        for refs in parents.values():
+            refs.difference_update(ready)
+
+    return order
+
+
+def _snapshot(items: Iterable[TransactionItem]) -> list[tuple]:
+    """Returns the records' primary keys and dirty fields."""
+
+    return [
+        (item.record, item.record._pk, set(item.record._dirty))
+        for item in items
+        if isinstance(item.record, Model)
+    ]
+
+
+def _restore(snapshot: list[tuple]) -> None:
+    """Restores the records' primary keys and dirty fields
+    after the transaction writing them has been rolled back,
+    so that they can be committed again.
+    """
+
+    for record, primary_key, dirty in snapshot:
+        record._pk = primary_key
+        record._dirty = dirty
+
+
+def _write(items: Iterable[TransactionItem]) -> None:
+    """Writes the items in batches."""
+
+    batch = None
+
+    for item in items:
+        if (key := _get_batch_key(item)) is None:
+            continue
+
+        if batch is not None:
+            if batch[:3] == key and batch.add(item.record):
+                continue
+
+            batch.execute()
+
+            # The record may have been written by the batch.
+            if (key := _get_batch_key(item)) is None:
+                batch = None
+                continue
+
+        batch = Batch.start(key, item.record)
+
+    if batch is not None:
+        batch.execute()
+
+
+def _get_batch_key(item: TransactionItem) -> Optional[tuple]:
+    """Returns the model, operation and fields of
+    the item or None if there is nothing to write.
+    """
+
+    if not isinstance(record := item.record, Model):  # E.g. sub-transactions.
+        return type(record), "delete_instance" if item.delete else "save", frozenset()
+
+    model = type(record)
+
+    if item.delete:
+        if model.delete_instance not in PLAIN_DELETES:
+            return model, "delete_instance", frozenset()
+
+        return model, "delete", frozenset()
+
+    if model.save not in PLAIN_SAVES or model._meta.composite_key:
+        return model, "save", frozenset()
+
+    if record._pk is None:
+        if not model._meta.auto_increment:
+            return model, "save", frozenset()
+
+        return model, "insert", frozenset(_get_field_dict(record))
+
+    if not (fields := frozenset(_get_field_dict(record))):
+        if not model._meta.only_save_dirty:
+            return model, "save", frozenset()  # Let save() raise.
+
+        record._dirty.clear()  # Nothing to save.
+        return None
+
+    return model, "update", fields
+
+
+def _get_keys(record: Model) -> set[tuple]:
+    """Returns keys identifying the record to records of its model."""
+
+    return {("id", id(record))} | {
+        (field.rel_field.name, value)
+        for field in _get_self_references(type(record))
+        if (value := record.__data__.get(field.rel_field.name)) is not None
+    }
+
+
+def _get_references(record: Model) -> set[tuple]:
+    """Returns keys of the records referred to by the record."""
+
+    return {("id", id(related)) for related in record.__rel__.values()} | {
+        (field.rel_field.name, value)
+        for field in _get_self_references(type(record))
+        if (value := record.__data__.get(field.name)) is not None
+    }
+
+
+def _get_self_references(model: Type[Model]) -> list[ForeignKeyField]:
+    """Returns the model's foreign keys to itself."""
+
+    return [
+        field
+        for field in model._meta.fields.values()
+        if isinstance(field, ForeignKeyField) and field.rel_model is model
+    ]
+
+
+def _get_field_dict(record: Model) -> dict[str, Any]:
+    """Returns the field values to be written like Model.save()."""
+
+    field_dict = record.__data__.copy()
+
+    if record._meta.only_save_dirty and record._pk is not None:
+        field_dict = {
+            name: value for name, value in field_dict.items() if name in record._dirty
+        }
+
+    record._populate_unsaved_relations(field_dict)
+    field_dict.pop(record._meta.primary_key.name, None)
+    return field_dict
+
+
+def _insert(model: Type[Model], records: list[Model], fields: frozenset[str]) -> None:
+    """Inserts the new records and sets their primary keys.
+
+    Databases that support RETURNING return the primary keys.
+    MySQL returns the first one of the auto-increment values of a
+    multi-row insert, which are auto_increment_increment apart.
+    On other databases, the records are saved one by one.
+    """
+
+    database = model._meta.database
+
+    if database.returning_clause:
+        step = None
+    elif _is_mysql(database):
+        step = database.execute_sql(
+            "SELECT @@SESSION.auto_increment_increment"
+        ).fetchone()[0]
+    else:
+        for record in records:
+            record.save()
+
+        return
+
+    primary_key = model._meta.primary_key
+    columns = [field for field in model._meta.sorted_fields if field.name in fields]
+
+    for chunk in chunked(records, get_chunk_size(database, len(columns))):
+        for record in chunk:
+            _get_field_dict(record)  # Populate unsaved relations.
+
+        query = model.insert_many(
+            [
+                [record.__data__.get(field.name) for field in columns]
+                for record in chunk
+            ],
+            fields=columns,
+        )
+
+        if step is None:
+            ids = [id_ for id_, in query.returning(primary_key).tuples().execute()]
+        else:
+            ids = range(first := query.execute(), first + step * len(chunk), step)
+
+        for record, id_ in zip(chunk, ids):
+            record._pk = id_
+            record._dirty -= fields
+            record._dirty.discard(primary_key.name)
+
+
+def _is_mysql(database: Union[Database, DatabaseProxy]) -> bool:
+    """Checks whether the database or the proxied database is MySQL."""
+
+    if isinstance(database, DatabaseProxy):
+        return _is_mysql(database.obj)
+
+    return isinstance(database, MySQLDatabase) or isinstance(
+        getattr(database, "_database", None), MySQLDatabase
+    )
+
+
+def _update(model: Type[Model], records: list[Model], fields: frozenset[str]) -> None:
+    """Updates the fields of the existing records by primary key."""
+
+    primary_key = model._meta.primary_key
+    columns = [field for field in model._meta.sorted_fields if field.name in fields]
+    # Each record binds its primary key and value per column and its primary key.
+    chunk_size = get_chunk_size(model._meta.database, 2 * len(columns) + 1)
+
+    for chunk in chunked(records, chunk_size):
+        if len(chunk) == 1:
+            chunk[0].save()
+            continue
+
+        model.update(
+            {
+                field: Case(
+                    primary_key,
+                    [
+                        (
+                            primary_key.to_value(record._pk),
+                            field.to_value(record.__data__.get(field.name)),
+                        )
+                        for record in chunk
+                    ],
+                )
+                for field in columns
+            }
+        ).where(primary_key.in_([record._pk for record in chunk])).execute()
+
+        for record in chunk:
+            record._dirty -= fields
+            invalidate(record)
+
+
+def _delete(model: Type[Model], records: list[Model]) -> None:
+    """Deletes the records by primary key."""
+
+    primary_key = model._meta.primary_key
+    pks = [record._pk for record in records if record._pk is not None]
+
+    for record in records:
+        invalidate(record)
+
+    for chunk in chunked(pks, get_chunk_size(model._meta.database, 1)):
+        model.delete().where(primary_key.in_(chunk)).execute()
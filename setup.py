@@ -14,7 +14,7 @@ setup(
         "python-magic",
         "peewee",
     ],
-    extras_require={"Argon2Field": ["argon2_cffi"]},
+    extras_require={"Argon2Field": ["argon2_cffi"], "orjson": ["orjson"]},
     author="HOMEINFO - Digitale Informationssysteme GmbH",
     author_email="<info@homeinfo.de>",
     maintainer="Richard Neumann",
@@ -0,0 +1,156 @@
+"""Tests of the asynchronous facade."""
+
+from asyncio import CancelledError, Event as AsyncEvent, create_task, gather
+from asyncio import get_running_loop, sleep
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from threading import Event
+from time import sleep as blocking_sleep
+from unittest import IsolatedAsyncioTestCase
+
+from peewee import CharField, SqliteDatabase, fn
+
+from peeweeplus.aio import AsyncDatabase, ExecutorStats
+from peeweeplus.json import JSONModel
+
+
+class SlowDatabase(SqliteDatabase):
+    """An SQLite database whose BEGIN can be delayed."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.begin_delay = 0
+        self.beginning = Event()
+
+    def begin(self, *args, **kwargs):
+        self.beginning.set()
+        blocking_sleep(self.begin_delay)
+        return super().begin(*args, **kwargs)
+
+
+DATABASE = SlowDatabase(None)
+
+
+class Item(JSONModel):
+    """A named item."""
+
+    class Meta:
+        database = DATABASE
+
+    name = CharField()
+
+
+class TestAsyncDatabase(IsolatedAsyncioTestCase):
+    """Tests the AsyncDatabase."""
+
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+        DATABASE.init(Path(self.directory.name) / "test.db")
+        DATABASE.begin_delay = 0
+        DATABASE.beginning.clear()
+        DATABASE.create_tables([Item])
+        DATABASE.close()
+
+    async def asyncSetUp(self):
+        self.database = AsyncDatabase(DATABASE, workers=1)
+
+    async def asyncTearDown(self):
+        await self.database.close()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    async def count(self) -> int:
+        """Returns the number of items."""
+        return await self.database.scalar(Item.select(fn.COUNT(Item.id)))
+
+    async def test_queries(self):
+        await self.database.execute(Item.insert(name="a"))
+        await self.database.save(Item(name="b"))
+        self.assertEqual(await self.count(), 2)
+        items = await self.database.fetch(Item.select().order_by(Item.id))
+        self.assertEqual([item.name for item in items], ["a", "b"])
+
+    async def test_json(self):
+        item = await self.database.from_json(Item, {"name": "a"})
+        await self.database.save(item)
+        self.assertEqual(
+            await self.database.to_json(Item.select()), [{"id": 1, "name": "a"}]
+        )
+
+    async def test_concurrency_limit(self):
+        database = AsyncDatabase(DATABASE, workers=2)
+        tasks = [create_task(database.run(blocking_sleep, 0.1)) for _ in range(5)]
+        await sleep(0.02)
+        self.assertEqual(database.stats(), ExecutorStats(2, 2, 3))
+
+        try:
+            await gather(*tasks)
+        finally:
+            await database.close()
+
+        self.assertEqual(database.stats(), ExecutorStats(2, 0, 0))
+
+    async def test_atomic(self):
+        async with self.database.atomic():
+            await self.database.save(Item(name="a"))
+
+        with self.assertRaises(ValueError):
+            async with self.database.atomic():
+                await self.database.save(Item(name="b"))
+                raise ValueError()
+
+        self.assertEqual(await self.count(), 1)
+
+    async def test_cancel_waiting(self):
+        called = []
+        blocker = create_task(self.database.run(blocking_sleep, 0.1))
+        await sleep(0.01)
+        waiting = create_task(self.database.run(called.append, True))
+        await sleep(0.01)
+        self.assertEqual(self.database.stats().waiting, 1)
+        waiting.cancel()
+
+        with self.assertRaises(CancelledError):
+            await waiting
+
+        await blocker
+        self.assertEqual(called, [])
+        self.assertEqual(self.database.stats().busy, 0)
+
+    async def test_cancel_in_atomic(self):
+        started = AsyncEvent()
+
+        async def transaction():
+            async with self.database.atomic():
+                await self.database.save(Item(name="a"))
+                started.set()
+                await sleep(1)
+
+        task = create_task(transaction())
+        await started.wait()
+        task.cancel()
+
+        with self.assertRaises(CancelledError):
+            await task
+
+        self.assertFalse(await self.database.run(DATABASE.in_transaction))
+        self.assertEqual(await self.count(), 0)
+
+    async def test_cancel_while_beginning(self):
+        DATABASE.begin_delay = 0.1
+
+        async def transaction():
+            async with self.database.atomic():
+                await self.database.save(Item(name="a"))
+
+        task = create_task(transaction())
+        await get_running_loop().run_in_executor(None, DATABASE.beginning.wait)
+        task.cancel()
+
+        with self.assertRaises(CancelledError):
+            await task
+
+        self.assertFalse(await self.database.run(DATABASE.in_transaction))
+        self.assertEqual(await self.count(), 0)
+        self.assertEqual(self.database.stats().busy, 0)
@@ -0,0 +1,253 @@
+"""Tests of the MySQL database enhancements on SQLite."""
+
+from itertools import islice
+from pathlib import Path
+from sqlite3 import Connection, Cursor, connect
+from tempfile import TemporaryDirectory
+from time import sleep
+from types import SimpleNamespace
+from unittest import TestCase
+from unittest.mock import patch
+
+from peewee import CharField, Model
+
+from peeweeplus.database import MySQLDatabase, PooledMySQLDatabase
+from peeweeplus.resultcache import ResultCache, Statement
+
+
+class BufferedCursor(Cursor):
+    """Fetches all rows on execution like MySQL's default cursor."""
+
+    def execute(self, *args):
+        super().execute(*args)
+        self.rows = iter(super().fetchall())
+        return self
+
+    def __next__(self):
+        return next(self.rows)
+
+    def fetchone(self):
+        return next(self.rows, None)
+
+    def fetchmany(self, size=1):
+        return list(islice(self.rows, size))
+
+    def fetchall(self):
+        return list(self.rows)
+
+
+class BufferedConnection(Connection):
+    """An SQLite connection with buffered cursors by default."""
+
+    def cursor(self, factory=BufferedCursor):
+        return super().cursor(factory)
+
+
+class SQLiteMySQLDatabase(MySQLDatabase):
+    """peeweeplus' MySQL database connecting to an SQLite file.
+    Its unbuffered SQLite cursors stand in for server-side cursors.
+    """
+
+    param = "?"
+
+    def _connect(self):
+        return connect(self.database, isolation_level=None, factory=BufferedConnection)
+
+    def _set_server_version(self, conn):
+        self.server_version = (8, 0, 0)
+
+
+class FakeConnection:
+    """A MySQL connection that records rollbacks."""
+
+    server_version = "8.0.0"
+
+    def __init__(self):
+        self.in_transaction = False
+        self.rollbacks = 0
+        self.closed = False
+
+    def ping(self, reconnect=True):
+        if self.closed:
+            raise ConnectionError()
+
+    def rollback(self):
+        self.in_transaction = False
+        self.rollbacks += 1
+
+    def close(self):
+        self.closed = True
+
+
+class Setting(Model):
+    """A named setting."""
+
+    name = CharField()
+
+
+class DatabaseTestCase(TestCase):
+    """Binds the setting model to an SQLite file."""
+
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+        self.cache = ResultCache([Setting])
+        self.database = SQLiteMySQLDatabase(
+            str(Path(self.directory.name) / "test.db"), result_cache=self.cache
+        )
+        Setting._meta.set_database(self.database)
+        self.database.execute_sql(
+            "CREATE TABLE setting (id INTEGER PRIMARY KEY, name VARCHAR(255))"
+        )
+        Setting.create(name="initial")
+        self.cache.clear()
+
+    def tearDown(self):
+        self.database.close()
+        self.directory.cleanup()
+
+    def get_name(self) -> str:
+        """Returns the setting's name."""
+        return Setting.select(Setting.name).scalar()
+
+
+class TestStreaming(DatabaseTestCase):
+    """Tests streaming of query results."""
+
+    def setUp(self):
+        super().setUp()
+        cursors = SimpleNamespace(SSCursor=Cursor)
+        self.enterContext(
+            patch("peeweeplus.database.mysql", SimpleNamespace(cursors=cursors))
+        )
+
+    def test_streaming(self):
+        with self.database.streaming():
+            self.assertTrue(self.database.is_streaming())
+            self.assertEqual(
+                [setting.name for setting in Setting.select()], ["initial"]
+            )
+            self.assertFalse(self.database.is_closed())
+
+        self.assertFalse(self.database.is_streaming())
+        self.assertTrue(self.database.is_closed())
+
+    def test_streaming_in_transaction(self):
+        with self.database.atomic():
+            Setting.create(name="new")
+
+            with self.database.streaming():
+                self.assertEqual(len(list(Setting.select())), 2)
+
+            self.assertTrue(self.database.in_transaction())
+
+        self.assertEqual(Setting.select().count(), 2)
+
+    def test_streaming_bypasses_cache(self):
+        with self.database.streaming():
+            self.get_name()
+            self.get_name()
+
+        self.assertEqual(self.cache.cache_info().currsize, 0)
+
+
+class TestResultCache(DatabaseTestCase):
+    """Tests the result cache of the database."""
+
+    def test_hits(self):
+        self.assertEqual(self.get_name(), "initial")
+        self.assertEqual(self.get_name(), "initial")
+        self.assertEqual(self.cache.cache_info().hits, 1)
+
+    def test_query_invalidates(self):
+        self.get_name()
+        Setting.update(name="updated").execute()
+        self.assertEqual(self.get_name(), "updated")
+
+    def test_raw_sql_invalidates(self):
+        for sql in (
+            "UPDATE setting SET name = 'unquoted'",
+            "UPDATE \"setting\" SET name = 'double-quoted'",
+            "UPDATE `setting` SET name = 'backtick-quoted'",
+        ):
+            with self.subTest(sql=sql):
+                self.get_name()
+                self.database.execute_sql(sql)
+                self.assertEqual(self.get_name(), sql.split("'")[1])
+
+    def test_unknown_tables_invalidate_all(self):
+        self.assertEqual(
+            self.cache.get_tables("CALL refresh()"), Statement(False, self.cache.tables)
+        )
+        self.assertEqual(
+            self.cache.get_tables("SAVEPOINT s1"), Statement(False, frozenset())
+        )
+        self.assertEqual(
+            self.cache.get_tables("DELETE FROM other"), Statement(False, frozenset())
+        )
+
+    def test_atomic_commit(self):
+        self.get_name()
+
+        with self.database.atomic():
+            self.database.execute_sql("UPDATE setting SET name = 'committed'")
+            self.assertEqual(self.get_name(), "committed")
+
+        self.assertEqual(self.get_name(), "committed")
+
+    def test_atomic_rollback(self):
+        self.get_name()
+
+        with self.database.atomic() as transaction:
+            self.database.execute_sql("UPDATE setting SET name = 'rolled back'")
+            self.assertEqual(self.get_name(), "rolled back")
+            transaction.rollback()
+
+        self.assertEqual(self.get_name(), "initial")
+
+    def test_savepoint_rollback(self):
+        with self.database.atomic():
+            with self.database.atomic() as savepoint:
+                self.database.execute_sql("UPDATE setting SET name = 'rolled back'")
+                savepoint.rollback()
+
+            self.assertEqual(self.get_name(), "initial")
+
+        self.assertEqual(self.get_name(), "initial")
+        self.assertEqual(self.get_name(), "initial")
+        self.assertEqual(self.cache.cache_info().hits, 1)
+
+
+class TestPooledMySQLDatabase(TestCase):
+    """Tests the connection pool."""
+
+    def setUp(self):
+        self.enterContext(
+            patch.object(MySQLDatabase, "_connect", FakeConnection, create=True)
+        )
+
+    def test_rollback_on_check_in(self):
+        database = PooledMySQLDatabase("test")
+        database.connect()
+        (connection := database.connection()).in_transaction = True
+        database.close()
+        self.assertEqual(connection.rollbacks, 1)
+        database.connect()
+        self.assertIs(database.connection(), connection)
+
+    def test_idle_timeout(self):
+        database = PooledMySQLDatabase("test", idle_timeout=0.01)
+        database.connect()
+        connection = database.connection()
+        database.close()
+        sleep(0.02)
+        database.connect()
+        self.assertIsNot(database.connection(), connection)
+        self.assertTrue(connection.closed)
+
+    def test_close_idle(self):
+        database = PooledMySQLDatabase("test", idle_timeout=60)
+        database.connect()
+        database.close()
+        self.assertEqual(len(database._idle_since), 1)
+        database.close_idle()
+        self.assertEqual(database._idle_since, {})
@@ -0,0 +1,126 @@
+"""Tests of the read replica routing of database proxies."""
+
+from configparser import ConfigParser
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from peewee import CharField, Model, SqliteDatabase
+
+from peeweeplus.dbproxy import CONFIGS, DatabaseProxy
+from peeweeplus.transaction import Transaction
+
+
+HOSTS = ("primary", "replica1", "replica2")
+
+
+class HostDatabase(SqliteDatabase):
+    """An SQLite database whose file stands in for a host."""
+
+    def init(self, database, host=None, **_):
+        super().init(database if host is None else host)
+
+
+class HostDatabaseProxy(DatabaseProxy, dbtype=HostDatabase):
+    """A database proxy to SQLite files."""
+
+
+class Item(Model):
+    """An item holding the name of the host it is stored on."""
+
+    name = CharField()
+
+
+class TestReplicaRouting(TestCase):
+    """Tests the routing of queries to the primary and replicas."""
+
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+        self.paths = {host: Path(self.directory.name) / f"{host}.db" for host in HOSTS}
+
+        for host, path in self.paths.items():
+            database = SqliteDatabase(path)
+
+            with database.bind_ctx([Item]):
+                database.create_tables([Item])
+                Item.create(name=host)
+
+            database.close()
+
+        self.proxies = []
+        self.database = self.get_proxy()
+
+    def tearDown(self):
+        for proxy in self.proxies:
+            for database in [proxy._database, *proxy._replicas]:
+                database.close()
+
+        CONFIGS.pop("test.conf", None)
+        self.directory.cleanup()
+
+    def get_proxy(self, **options) -> HostDatabaseProxy:
+        """Returns a proxy to the primary and
+        the replicas and binds the model to it.
+        """
+        config = ConfigParser()
+        config["db"] = {
+            "host": str(self.paths["primary"]),
+            "passwd": "",
+            "replicas": f"{self.paths['replica1']}, {self.paths['replica2']}",
+            **options,
+        }
+        CONFIGS["test.conf"] = config
+        self.proxies.append(proxy := HostDatabaseProxy("test", "test.conf"))
+        Item._meta.set_database(proxy)
+        return proxy
+
+    def test_round_robin(self):
+        self.assertEqual(
+            [Item.get().name for _ in range(4)],
+            ["replica1", "replica2", "replica1", "replica2"],
+        )
+
+    def test_least_busy(self):
+        self.database = self.get_proxy(replica_selection="least_busy")
+
+        for _ in range(3):
+            self.assertEqual(Item.get().name, "replica1")
+
+        self.assertEqual(set(self.database._busy.values()), {0})
+
+    def test_writes_go_to_primary(self):
+        Item.create(name="new")
+        Item.update(name="updated").where(Item.name == "new").execute()
+        self.assertEqual(Item.select().where(Item.name == "updated").count(), 0)
+
+        with self.database.use_primary():
+            self.assertEqual(Item.get(Item.name == "updated").name, "updated")
+
+    def test_transactions_use_primary(self):
+        with self.database.atomic():
+            self.assertEqual(Item.get().name, "primary")
+
+        transaction = Transaction()
+        transaction.add(Item(name="new"))
+        transaction.commit()
+
+        with self.database.use_primary():
+            self.assertEqual(Item.select().count(), 2)
+
+    def test_use_primary(self):
+        with self.database.use_primary():
+            with self.database.use_primary():
+                self.assertEqual(Item.get().name, "primary")
+
+            self.assertEqual(Item.get().name, "primary")
+
+        self.assertEqual(Item.get().name, "replica1")
+
+    def test_for_update_uses_primary(self):
+        Item.get()  # Initialize the proxy.
+        self.assertIsNone(self.database._get_replica(Item.select().for_update()))
+        self.assertIsNotNone(self.database._get_replica(Item.select()))
+
+    def test_without_replicas(self):
+        self.database = self.get_proxy(replicas="")
+        self.assertEqual([Item.get().name for _ in range(2)], ["primary", "primary"])
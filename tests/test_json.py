@@ -0,0 +1,233 @@
+"""Tests of the JSON API."""
+
+from decimal import Decimal
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from peewee import BlobField, CharField, DecimalField, IntegerField, Model
+from peewee import SqliteDatabase, fn
+
+from peeweeplus.exceptions import NonUniqueValue
+from peeweeplus.json import JSONCache, deserialize, deserialize_many, insert_json
+from peeweeplus.json import patch, save_changes, serialize, serialize_bytes
+from peeweeplus.json import serialize_many
+from peeweeplus.json.blob import blob_stub, decode_blob, encode_blob
+from peeweeplus.json.deserialization import CONVERTER as DESERIALIZER
+from peeweeplus.json.serialization import CONVERTER as SERIALIZER
+
+
+DATABASE = SqliteDatabase(None)
+
+
+class Price(Model):
+    """A named price."""
+
+    name = CharField()
+    amount = DecimalField()
+
+
+class User(Model):
+    """A user with a unique name and an optional unique email address."""
+
+    class Meta:
+        database = DATABASE
+
+    name = CharField(unique=True)
+    email = CharField(null=True, unique=True)
+    version = IntegerField(null=True, default=0)
+
+
+class File(Model):
+    """A file with binary data."""
+
+    class Meta:
+        database = DATABASE
+
+    data = BlobField()
+
+
+class DatabaseTestCase(TestCase):
+    """Creates the tables in an SQLite file."""
+
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+        DATABASE.init(Path(self.directory.name) / "test.db")
+        DATABASE.create_tables([User, File])
+        DATABASE.close()
+
+    def tearDown(self):
+        DATABASE.close()
+        self.directory.cleanup()
+
+    def count(self) -> int:
+        """Returns the number of users."""
+        return User.select(fn.COUNT(User.id)).scalar()
+
+
+class TestConverters(TestCase):
+    """Tests changes of the converters after the plans were cached."""
+
+    def test_serialization(self):
+        price = Price(name="a", amount=Decimal("1.50"))
+        self.assertEqual(serialize(price)["amount"], 1.5)
+        SERIALIZER[DecimalField] = str
+
+        try:
+            self.assertEqual(serialize(price)["amount"], "1.50")
+            self.assertIn(b'"amount":"1.50"', serialize_bytes(price))
+        finally:
+            SERIALIZER[DecimalField] = float
+
+        self.assertEqual(serialize(price)["amount"], 1.5)
+
+    def test_deserialization(self):
+        self.assertEqual(deserialize(Price, {"name": "a", "amount": 1}).amount, 1.0)
+        DESERIALIZER[DecimalField] = Decimal
+
+        try:
+            price = deserialize(Price, {"name": "a", "amount": "1.50"})
+            self.assertIsInstance(price.amount, Decimal)
+        finally:
+            DESERIALIZER[DecimalField] = float
+
+
+class TestDeserializeMany(DatabaseTestCase):
+    """Tests the batched uniqueness checks of deserialize_many()."""
+
+    def test_unique(self):
+        users = deserialize_many(User, [{"name": "a"}, {"name": "b"}])
+        self.assertEqual([user.name for user in users], ["a", "b"])
+
+    def test_duplicate_in_chunk(self):
+        with self.assertRaises(NonUniqueValue):
+            list(deserialize_many(User, [{"name": "a"}, {"name": "a"}]))
+
+    def test_duplicate_across_chunks(self):
+        users = deserialize_many(
+            User, [{"name": "a"}, {"name": "b"}, {"name": "a"}], chunk_size=2
+        )
+
+        with self.assertRaises(NonUniqueValue):
+            list(users)
+
+    def test_existing_duplicate(self):
+        User.create(name="a")
+
+        with self.assertRaises(NonUniqueValue):
+            list(deserialize_many(User, [{"name": "b"}, {"name": "a"}]))
+
+    def test_multiple_nulls(self):
+        jsons = [
+            {"name": "a", "email": None},
+            {"name": "b", "email": None},
+            {"name": "c", "email": "c@example.com"},
+        ]
+        users = list(deserialize_many(User, jsons, chunk_size=2))
+        self.assertEqual([user.email for user in users], [None, None, "c@example.com"])
+
+
+class TestInsertJSON(DatabaseTestCase):
+    """Tests insert_json()."""
+
+    def test_insert(self):
+        self.assertEqual(insert_json(User, [{"name": "a"}, {"name": "b"}]), [2])
+        self.assertTrue(DATABASE.is_closed())
+        self.assertEqual([user.version for user in User.select()], [0, 0])
+
+    def test_insert_in_transaction(self):
+        with DATABASE.atomic():
+            insert_json(User, [{"name": "a"}])
+            self.assertFalse(DATABASE.is_closed())
+
+        self.assertEqual(self.count(), 1)
+
+    def test_rollback(self):
+        # Rows per INSERT are fewer than objects per uniqueness check,
+        # so the duplicate is detected after the first INSERT.
+        jsons = [{"name": str(index)} for index in range(500)]
+        jsons.append({"name": "0"})
+
+        with self.assertRaises(NonUniqueValue):
+            insert_json(User, jsons)
+
+        self.assertTrue(DATABASE.is_closed())
+        self.assertEqual(self.count(), 0)
+
+
+class TestPatch(DatabaseTestCase):
+    """Tests patch() and save_changes()."""
+
+    def test_patch(self):
+        user = User.create(name="a", email="a@example.com")
+        changes = patch(user, {"name": "a", "email": "b@example.com"})
+        self.assertEqual(changes, {"email": "b@example.com"})
+        User.update(name="changed").execute()
+        self.assertEqual(save_changes(user, changes), 1)
+        user = User.get()
+        self.assertEqual((user.name, user.email), ("changed", "b@example.com"))
+
+    def test_no_changes(self):
+        user = User.create(name="a")
+        self.assertEqual(save_changes(user, patch(user, {"name": "a"})), 0)
+
+
+class TestJSONCache(DatabaseTestCase):
+    """Tests the JSONCache."""
+
+    def setUp(self):
+        super().setUp()
+        self.cache = JSONCache(version="version")
+
+    def test_hits(self):
+        user = User.create(name="a")
+        self.assertEqual(self.cache.serialize(user)["name"], "a")
+        self.assertEqual(self.cache.serialize(User.get())["name"], "a")
+        self.assertEqual(self.cache.cache_info()[:2], (1, 1))
+
+    def test_versions(self):
+        user = User.create(name="a")
+        stale = User.get()
+        self.cache.serialize(user)
+        user.name = "b"
+        self.assertEqual(self.cache.serialize(user)["name"], "b")  # Dirty.
+        user.version += 1
+        user.save()
+        self.assertEqual(self.cache.serialize(User.get())["name"], "b")
+        self.assertEqual(self.cache.serialize(stale)["name"], "a")
+
+    def test_without_version(self):
+        user = User.create(name="a", version=None)
+        self.cache.serialize(user)
+        self.assertEqual(self.cache.cache_info().currsize, 0)
+
+
+class TestSerializeMany(DatabaseTestCase):
+    """Tests serialize_many()."""
+
+    def test_serialize_many(self):
+        User.create(name="a", email="a@example.com")
+        User.create(name="b")
+        self.assertEqual(
+            list(serialize_many(User.select().order_by(User.id))),
+            [serialize(user) for user in User.select().order_by(User.id)],
+        )
+
+
+class TestBlobs(DatabaseTestCase):
+    """Tests the encoding of binary data."""
+
+    def test_round_trip(self):
+        for size in (0, 1, 2, 3, 3 * 64 * 1024 + 1, 1_000_000):
+            with self.subTest(size=size):
+                data = bytes(range(256)) * (size // 256) + bytes(size % 256)
+                self.assertEqual(decode_blob(encode_blob(data)), data)
+
+    def test_whitespace(self):
+        self.assertEqual(decode_blob("aGVs\nbG8="), b"hello")
+
+    def test_serialization(self):
+        file = File.create(data=b"hello")
+        self.assertEqual(serialize(file)["data"], "aGVsbG8=")
+        self.assertEqual(serialize(file, blob_stubs=True)["data"], blob_stub(b"hello"))
+        self.assertEqual(deserialize(File, {"data": "aGVsbG8="}).data, b"hello")
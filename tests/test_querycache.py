@@ -0,0 +1,87 @@
+"""Tests of the compiled SQL cache."""
+
+from unittest import TestCase
+
+from peewee import CharField, Model, SqliteDatabase
+
+from peeweeplus.exceptions import NonUniqueValue
+from peeweeplus.json import deserialize
+from peeweeplus.querycache import QUERY_CACHE, Param, QueryCache, get_by_id
+
+
+DATABASE = SqliteDatabase(":memory:")
+OTHER_DATABASE = SqliteDatabase(":memory:")
+
+
+class User(Model):
+    """A user with a unique name."""
+
+    class Meta:
+        database = DATABASE
+
+    name = CharField(unique=True)
+
+
+class TestQueryCache(TestCase):
+    """Tests the QueryCache."""
+
+    def setUp(self):
+        for database in (DATABASE, OTHER_DATABASE):
+            with database.bind_ctx([User]):
+                database.create_tables([User])
+
+        User.create(name="alice")
+        User.create(name="bob")
+        QUERY_CACHE.clear()
+
+    def tearDown(self):
+        for database in (DATABASE, OTHER_DATABASE):
+            with database.bind_ctx([User]):
+                database.drop_tables([User])
+
+    def test_hits_and_misses(self):
+        cache = QueryCache(maxsize=2)
+
+        for name in ("alice", "bob", "alice"):
+            rows = cache.execute(
+                (User, "by_name"),
+                lambda: User.select().where(User.name == Param("name")),
+                DATABASE,
+                name=name,
+            )
+            self.assertEqual([user.name for user in rows], [name])
+
+        self.assertEqual(cache.cache_info().hits, 2)
+        self.assertEqual(cache.cache_info().misses, 1)
+
+    def test_eviction(self):
+        cache = QueryCache(maxsize=2)
+
+        for key in range(3):
+            cache.compile(key, User.select, DATABASE)
+
+        self.assertEqual(cache.cache_info().currsize, 2)
+
+    def test_get_by_id(self):
+        self.assertEqual(get_by_id(User, 2).name, "bob")
+
+        with self.assertRaises(User.DoesNotExist):
+            get_by_id(User, 3)
+
+    def test_is_unique(self):
+        with self.assertRaises(NonUniqueValue):
+            deserialize(User, {"name": "alice"})
+
+        self.assertEqual(deserialize(User, {"name": "carol"}).name, "carol")
+
+    def test_rebinding(self):
+        with self.assertRaises(NonUniqueValue):
+            deserialize(User, {"name": "alice"})
+
+        with OTHER_DATABASE.bind_ctx([User]):
+            self.assertEqual(deserialize(User, {"name": "alice"}).name, "alice")
+
+            with self.assertRaises(User.DoesNotExist):
+                get_by_id(User, 1)
+
+        self.assertEqual(get_by_id(User, 1).name, "alice")
@@ -0,0 +1,195 @@
+"""Tests of batched transactions."""
+
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from peewee import CharField, ForeignKeyField, Model, SqliteDatabase
+
+from peeweeplus.transaction import Transaction
+
+
+class RecordingDatabase(SqliteDatabase):
+    """An SQLite database that records the executed statements."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.statements = []
+
+    def execute_sql(self, sql, *args, **kwargs):
+        self.statements.append(sql)
+        return super().execute_sql(sql, *args, **kwargs)
+
+    def count(self, command: str) -> int:
+        """Returns the amount of recorded statements of the command."""
+        return sum(1 for sql in self.statements if sql.startswith(command))
+
+
+DATABASE = RecordingDatabase(None, pragmas={"foreign_keys": 1}, returning_clause=True)
+
+
+class Parent(Model):
+    """A parent with a unique name."""
+
+    class Meta:
+        database = DATABASE
+
+    name = CharField(unique=True)
+
+
+class Child(Model):
+    """A child of a parent."""
+
+    class Meta:
+        database = DATABASE
+
+    parent = ForeignKeyField(Parent, backref="children")
+    name = CharField()
+
+
+class Node(Model):
+    """A node of a tree."""
+
+    class Meta:
+        database = DATABASE
+
+    parent = ForeignKeyField("self", null=True, backref="children")
+    name = CharField()
+
+
+class TestTransaction(TestCase):
+    """Tests the Transaction."""
+
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+        DATABASE.init(Path(self.directory.name) / "test.db")
+        DATABASE.create_tables([Parent, Child, Node])
+        DATABASE.close()
+        DATABASE.statements.clear()
+
+    def tearDown(self):
+        DATABASE.close()
+        self.directory.cleanup()
+
+    def commit(self, transaction: Transaction, **kwargs) -> None:
+        """Commits the transaction and only records its statements."""
+        DATABASE.statements.clear()
+        transaction.commit(**kwargs)
+
+    def test_insert_batch(self):
+        transaction = Transaction()
+        parents = [Parent(name=name) for name in "abc"]
+
+        for parent in parents:
+            transaction.add(parent)
+
+        self.commit(transaction)
+        self.assertEqual(DATABASE.count("INSERT"), 1)
+        self.assertEqual([parent.id for parent in parents], [1, 2, 3])
+        self.assertFalse(any(parent.is_dirty() for parent in parents))
+        self.assertEqual(Parent.get_by_id(2).name, "b")
+
+    def test_update_batch(self):
+        Parent.insert_many([{"name": name} for name in "abc"]).execute()
+        transaction = Transaction()
+
+        for parent in Parent.select():
+            parent.name = parent.name.upper()
+            transaction.add(parent)
+
+        self.commit(transaction)
+        self.assertEqual(DATABASE.count("UPDATE"), 1)
+        self.assertEqual(
+            [parent.name for parent in Parent.select().order_by(Parent.id)],
+            ["A", "B", "C"],
+        )
+
+    def test_delete_batch(self):
+        Parent.insert_many([{"name": name} for name in "abc"]).execute()
+        transaction = Transaction()
+
+        for parent in Parent.select():
+            transaction.delete(parent)
+
+        self.commit(transaction)
+        self.assertEqual(DATABASE.count("DELETE"), 1)
+        self.assertEqual(Parent.select().count(), 0)
+
+    def test_add_left(self):
+        parent = Parent(name="a")
+        transaction = Transaction()
+        transaction.add(Child(parent=parent, name="b"))
+        transaction.add(parent, left=True)
+        self.commit(transaction)
+        self.assertEqual(Child.get().parent, parent)
+
+    def test_delete_left(self):
+        parent = Parent.create(name="a")
+        child = Child.create(parent=parent, name="b")
+        transaction = Transaction()
+        transaction.delete(parent)
+        transaction.delete(child, left=True)
+        self.commit(transaction)
+        self.assertEqual(Parent.select().count(), 0)
+        self.assertEqual(Child.select().count(), 0)
+
+    def test_self_reference_inserts(self):
+        root = Node(name="root")
+        leaf = Node(parent=root, name="leaf")
+        other = Node(parent=None, name="other")
+        transaction = Transaction()
+
+        for node in (root, leaf, other):
+            transaction.add(node)
+
+        self.commit(transaction)
+        self.assertEqual(DATABASE.count("INSERT"), 2)
+        self.assertEqual(Node.get(Node.name == "leaf").parent_id, root.id)
+
+    def test_self_reference_deletes(self):
+        root = Node.create(name="root")
+        leaf = Node.create(parent=root, name="leaf")
+        other = Node.create(name="other")
+        transaction = Transaction()
+
+        # Reload the records, so that the references are primary keys only.
+        for node in (leaf, root, other):
+            transaction.delete(Node.get_by_id(node.id))
+
+        self.commit(transaction)
+        self.assertEqual(DATABASE.count("DELETE"), 2)
+        self.assertEqual(Node.select().count(), 0)
+
+    def test_sort(self):
+        parent = Parent(name="a")
+        transaction = Transaction()
+        transaction.add(Child(parent=parent, name="b"))
+        transaction.add(parent)
+        self.commit(transaction, sort=True)
+        self.assertEqual(Child.get().parent, parent)
+
+    def test_sub_transaction(self):
+        for sort in (False, True):
+            with self.subTest(sort=sort):
+                parent = Parent(name=f"sorted: {sort}")
+                sub_transaction = Transaction()
+                sub_transaction.add(parent, primary=True)
+                transaction = Transaction()
+                transaction.add(sub_transaction)
+                transaction.add(Child(parent=parent, name="b"))
+                self.commit(transaction, sort=sort)
+                self.assertIsNotNone(parent.id)
+                self.assertEqual(Child.get(Child.parent == parent).name, "b")
+
+    def test_rollback(self):
+        transaction = Transaction()
+        parents = [Parent(name="a"), Parent(name="b"), Parent(name="a")]
+
+        for parent in parents:
+            transaction.add(parent)
+
+        with self.assertRaises(Exception):
+            self.commit(transaction, chunk_size=2)
+
+        self.assertEqual(Parent.select().count(), 0)
+        self.assertEqual([parent.id for parent in parents], [None, None, None])